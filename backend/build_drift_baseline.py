@@ -0,0 +1,55 @@
+"""Build drift_baseline.json for the already-trained model without retraining it.
+
+Run from backend/:  python build_drift_baseline.py
+Uses the dataset plus fertilizer_model.keras, preprocessor.pkl and label_encoder.pkl.
+"""
+import pandas as pd
+import numpy as np
+import tensorflow as tf
+import joblib
+import json
+import os
+from drift_monitor import build_baseline
+
+DATA_PATH = os.path.join("..", "smart_fertilizer_dataset.xlsx")
+MODEL_PATH = "fertilizer_model.keras"
+PREPROCESSOR_PATH = "preprocessor.pkl"
+ENCODER_PATH = "label_encoder.pkl"
+BASELINE_PATH = "drift_baseline.json"
+
+numeric_features = ['Soil_N', 'Soil_P', 'Soil_K', 'Soil_pH', 'Soil_Moisture']
+categorical_features = ['Crop_Name', 'Season']
+
+for path in (DATA_PATH, MODEL_PATH, PREPROCESSOR_PATH, ENCODER_PATH):
+    if not os.path.exists(path):
+        print(f"Error: {path} not found")
+        exit(1)
+
+print("Loading dataset and artifacts...")
+df = pd.read_excel(DATA_PATH)
+
+# Same column names as train_model.py
+df = df.rename(columns={
+    'Soil_N (ppm)': 'Soil_N',
+    'Soil_P (ppm)': 'Soil_P',
+    'Soil_K (ppm)': 'Soil_K',
+    'Soil_Moisture (%)': 'Soil_Moisture'
+})
+X = df[numeric_features + categorical_features]
+
+model = tf.keras.models.load_model(MODEL_PATH)
+preprocessor = joblib.load(PREPROCESSOR_PATH)
+label_encoder = joblib.load(ENCODER_PATH)
+
+print("Predicting on the dataset...")
+predictions = model.predict(preprocessor.transform(X), batch_size=1024, verbose=0)
+baseline = build_baseline(
+    X, numeric_features, categorical_features,
+    label_encoder.inverse_transform(np.argmax(predictions[0], axis=1)),
+    np.maximum(predictions[1][:, 0], 0),
+    np.clip(predictions[2][:, 0], 0, 1),
+)
+
+with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+    json.dump(baseline, f, indent=2)
+print(f"Done! Drift baseline saved to backend/{BASELINE_PATH}")
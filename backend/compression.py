@@ -0,0 +1,71 @@
+import gzip
+
+# Optional: brotli is only offered when installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Responses smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 512
+
+
+def supported_encodings():
+    """Encodings this server can produce, most preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def parse_accept_encoding(header):
+    """{coding: q} for an Accept-Encoding header. Malformed q-values count as 0."""
+    weights = {}
+    for token in (header or '').split(','):
+        parts = [part.strip() for part in token.split(';')]
+        coding = parts[0].lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    return weights
+
+
+def negotiate_encoding(header):
+    """Pick the content coding for an Accept-Encoding header, or None for identity.
+
+    Codings with q=0 are refused (RFC 9110, section 12.5.3); '*' covers codings not
+    listed explicitly. Among acceptable codings the highest q wins, brotli on ties.
+    """
+    weights = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for coding in supported_encodings():
+        q = weights.get(coding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=4)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=5)
+    return body
+
+
+def _opaque_tag(tag):
+    return tag[2:] if tag.startswith('W/') else tag
+
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header matches `etag` (weak comparison, '*' matches anything)."""
+    for tag in (if_none_match or '').split(','):
+        tag = tag.strip()
+        if tag == '*' or _opaque_tag(tag) == _opaque_tag(etag):
+            return True
+    return False
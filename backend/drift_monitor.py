@@ -0,0 +1,331 @@
+import json
+import math
+import os
+import threading
+from bisect import bisect_right
+
+import numpy as np
+
+DEFAULT_BINS = 10
+# Probability outputs are always in [0, 1], so their bins need no baseline
+PROBABILITY_CUTS = [round(0.1 * i, 1) for i in range(1, 10)]
+MAX_UNKNOWN_EXAMPLES = 20
+# Distinct values counted when no known category list is available
+MAX_TRACKED_CATEGORIES = 100
+PSI_EPSILON = 1e-4
+
+
+def quantile_cuts(values, n_bins=DEFAULT_BINS):
+    """Interior cut points splitting `values` into roughly equal-count bins."""
+    cuts = np.unique(np.quantile(np.asarray(values, dtype=float), np.linspace(0, 1, n_bins + 1)[1:-1]))
+    return [float(c) for c in cuts]
+
+
+def bin_proportions(values, cuts):
+    counts = np.bincount(np.searchsorted(cuts, np.asarray(values, dtype=float), side='right'), minlength=len(cuts) + 1)
+    return (counts / max(counts.sum(), 1)).tolist()
+
+
+def category_proportions(values):
+    values = [str(v) for v in values]
+    unique, counts = np.unique(values, return_counts=True)
+    return {str(u): float(c) / len(values) for u, c in zip(unique, counts)}
+
+
+def build_baseline(features, numeric_features, categorical_features, predicted_types, quantities, probabilities, n_bins=DEFAULT_BINS):
+    """Training-time reference distributions, saved next to the model by train_model.py."""
+    baseline = {"numeric": {}, "categorical": {}, "outputs": {}}
+    for name in numeric_features:
+        values = features[name].astype(float).values
+        cuts = quantile_cuts(values, n_bins)
+        baseline["numeric"][name] = {
+            "cuts": cuts,
+            "proportions": bin_proportions(values, cuts),
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+        }
+    for name in categorical_features:
+        baseline["categorical"][name] = {"proportions": category_proportions(features[name].values)}
+
+    quantity_cuts = quantile_cuts(quantities, n_bins)
+    baseline["outputs"] = {
+        "fertilizer_type": {"proportions": category_proportions(predicted_types)},
+        "quantity": {"cuts": quantity_cuts, "proportions": bin_proportions(quantities, quantity_cuts)},
+        "probability": {"cuts": PROBABILITY_CUTS, "proportions": bin_proportions(probabilities, PROBABILITY_CUTS)},
+    }
+    return baseline
+
+
+def psi(expected, actual):
+    """Population Stability Index between two proportion vectors."""
+    total = 0.0
+    for e, a in zip(expected, actual):
+        e, a = max(e, PSI_EPSILON), max(a, PSI_EPSILON)
+        total += (a - e) * math.log(a / e)
+    return total
+
+
+def ks_statistic(expected, actual):
+    """Largest gap between the two binned CDFs (a histogram approximation of the KS statistic)."""
+    gap, cdf_e, cdf_a = 0.0, 0.0, 0.0
+    for e, a in zip(expected, actual):
+        cdf_e += e
+        cdf_a += a
+        gap = max(gap, abs(cdf_e - cdf_a))
+    return gap
+
+
+def psi_status(value):
+    if value is None:
+        return 'no_baseline'
+    if value < 0.1:
+        return 'stable'
+    if value < 0.25:
+        return 'moderate_shift'
+    return 'significant_shift'
+
+
+class NumericSketch:
+    """Fixed-bin histogram plus running moments: O(1) memory, mergeable by addition.
+
+    NaN and infinite values are only counted in `non_finite`; a single one would
+    otherwise make the mean and variance NaN for good.
+    """
+
+    def __init__(self, cuts=None):
+        self.cuts = list(cuts or [])
+        self.bins = [0] * (len(self.cuts) + 1)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.non_finite = 0
+
+    def add(self, value):
+        if not math.isfinite(value):
+            self.non_finite += 1
+            return
+        self.bins[bisect_right(self.cuts, value)] += 1
+        # Welford's online mean/variance
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, state):
+        self.non_finite += state.get("non_finite", 0)
+        if state["count"] == 0:
+            return
+        if not all(math.isfinite(state[key]) for key in ("mean", "m2", "min", "max")):
+            raise ValueError("sketch state has non-finite moments")
+        for i, c in enumerate(state["bins"]):
+            self.bins[i] += c
+        # Chan et al. parallel combination of the moments
+        total = self.count + state["count"]
+        delta = state["mean"] - self.mean
+        self.m2 += state["m2"] + delta * delta * self.count * state["count"] / total
+        self.mean += delta * state["count"] / total
+        self.count = total
+        self.min = state["min"] if self.min is None else min(self.min, state["min"])
+        self.max = state["max"] if self.max is None else max(self.max, state["max"])
+
+    def state(self):
+        return {"bins": list(self.bins), "count": self.count, "mean": self.mean, "m2": self.m2, "min": self.min, "max": self.max,
+                "non_finite": self.non_finite}
+
+    def proportions(self):
+        return [c / self.count for c in self.bins] if self.count else None
+
+
+class CategorySketch:
+    """Counts for the known categories plus a single counter for anything unknown.
+
+    Without a known list, the first `max_categories` distinct values are counted and
+    any later new value goes to the unknown counter, so memory stays bounded.
+    """
+
+    def __init__(self, known=None, max_categories=MAX_TRACKED_CATEGORIES):
+        self.known = set(known or [])
+        self.max_categories = max_categories
+        self.counts = {}
+        self.unknown = 0
+        self.unknown_examples = []
+
+    def _is_tracked(self, value):
+        if self.known:
+            return value in self.known
+        return value in self.counts or len(self.counts) < self.max_categories
+
+    def _add_unknown(self, value, count):
+        self.unknown += count
+        if value not in self.unknown_examples and len(self.unknown_examples) < MAX_UNKNOWN_EXAMPLES:
+            self.unknown_examples.append(value)
+
+    def add(self, value):
+        value = str(value)
+        if not self._is_tracked(value):
+            self._add_unknown(value, 1)
+            return
+        self.counts[value] = self.counts.get(value, 0) + 1
+
+    def merge(self, state):
+        for value, c in state["counts"].items():
+            if self._is_tracked(value):
+                self.counts[value] = self.counts.get(value, 0) + c
+            else:
+                self._add_unknown(value, c)
+        self.unknown += state["unknown"]
+        for value in state["unknown_examples"]:
+            if value not in self.unknown_examples and len(self.unknown_examples) < MAX_UNKNOWN_EXAMPLES:
+                self.unknown_examples.append(value)
+
+    def state(self):
+        return {"counts": dict(self.counts), "unknown": self.unknown, "unknown_examples": list(self.unknown_examples)}
+
+    @property
+    def total(self):
+        return sum(self.counts.values()) + self.unknown
+
+
+class DriftMonitor:
+    """Streaming comparison of live /predict inputs and outputs against the training baseline.
+
+    Every sketch has a fixed size (bins from the baseline, categories from the fitted
+    encoder), so memory does not grow with traffic. `state()` / `merge()` let several
+    workers' monitors be combined into one report.
+    """
+
+    def __init__(self, numeric_features, categorical_features, baseline=None, known_categories=None):
+        self.baseline = baseline
+        self.numeric_features = list(numeric_features)
+        self.categorical_features = list(categorical_features)
+        self.known_categories = known_categories or {}
+        baseline = baseline or {"numeric": {}, "categorical": {}, "outputs": {}}
+
+        self._lock = threading.Lock()
+        self.numeric = {
+            name: NumericSketch(baseline["numeric"].get(name, {}).get("cuts"))
+            for name in self.numeric_features
+        }
+        self.categorical = {
+            name: CategorySketch(self.known_categories.get(name) or baseline["categorical"].get(name, {}).get("proportions", {}).keys())
+            for name in self.categorical_features
+        }
+        outputs = baseline["outputs"]
+        self.fertilizer_type = CategorySketch()
+        self.quantity = NumericSketch(outputs.get("quantity", {}).get("cuts"))
+        self.probability = NumericSketch(PROBABILITY_CUTS)
+
+    @classmethod
+    def from_file(cls, path, numeric_features, categorical_features, known_categories=None):
+        baseline = None
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding='utf-8') as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error loading drift baseline: {e}")
+        else:
+            print("Drift baseline not found. Run build_drift_baseline.py to create it.")
+        return cls(numeric_features, categorical_features, baseline, known_categories)
+
+    def empty_copy(self):
+        """A monitor with the same baseline and categories but no observations."""
+        return DriftMonitor(self.numeric_features, self.categorical_features, self.baseline, self.known_categories)
+
+    def observe(self, features, predicted_type, quantity, probability):
+        """Record one live prediction. `features` maps feature name -> raw input value."""
+        with self._lock:
+            for name in self.numeric_features:
+                self.numeric[name].add(float(features[name]))
+            for name in self.categorical_features:
+                self.categorical[name].add(features[name])
+            self.fertilizer_type.add(predicted_type)
+            self.quantity.add(float(quantity))
+            self.probability.add(float(probability))
+
+    def state(self):
+        with self._lock:
+            return {
+                "numeric": {name: sketch.state() for name, sketch in self.numeric.items()},
+                "categorical": {name: sketch.state() for name, sketch in self.categorical.items()},
+                "outputs": {
+                    "fertilizer_type": self.fertilizer_type.state(),
+                    "quantity": self.quantity.state(),
+                    "probability": self.probability.state(),
+                },
+            }
+
+    def merge(self, state):
+        """Add another monitor's `state()` (same baseline) into this one."""
+        with self._lock:
+            for name, sketch_state in state["numeric"].items():
+                self.numeric[name].merge(sketch_state)
+            for name, sketch_state in state["categorical"].items():
+                self.categorical[name].merge(sketch_state)
+            self.fertilizer_type.merge(state["outputs"]["fertilizer_type"])
+            self.quantity.merge(state["outputs"]["quantity"])
+            self.probability.merge(state["outputs"]["probability"])
+
+    @staticmethod
+    def _compare_bins(sketch, reference):
+        live = sketch.proportions()
+        report = {
+            "count": sketch.count,
+            "mean": sketch.mean if sketch.count else None,
+            "std": math.sqrt(sketch.m2 / sketch.count) if sketch.count else None,
+            "min": sketch.min,
+            "max": sketch.max,
+            "non_finite": sketch.non_finite,
+            "psi": None,
+            "ks": None,
+        }
+        if reference and live:
+            report["psi"] = round(psi(reference["proportions"], live), 4)
+            report["ks"] = round(ks_statistic(reference["proportions"], live), 4)
+            if "mean" in reference:
+                report["baseline_mean"] = reference["mean"]
+        report["status"] = psi_status(report["psi"]) if live else 'no_data'
+        return report
+
+    @staticmethod
+    def _compare_categories(sketch, reference):
+        total = sketch.total
+        report = {
+            "count": total,
+            "unknown": sketch.unknown,
+            "unknown_rate": round(sketch.unknown / total, 4) if total else None,
+            "unknown_examples": list(sketch.unknown_examples),
+            "psi": None,
+        }
+        if reference and total:
+            expected = reference["proportions"]
+            categories = sorted(set(expected) | set(sketch.counts))
+            # Unknown values are their own bucket; the baseline has none of them by construction
+            report["psi"] = round(psi(
+                [expected.get(c, 0.0) for c in categories] + [0.0],
+                [sketch.counts.get(c, 0) / total for c in categories] + [sketch.unknown / total],
+            ), 4)
+        report["status"] = psi_status(report["psi"]) if total else 'no_data'
+        return report
+
+    def report(self):
+        baseline = self.baseline or {"numeric": {}, "categorical": {}, "outputs": {}}
+        outputs = baseline["outputs"]
+        with self._lock:
+            return {
+                "baseline_loaded": self.baseline is not None,
+                "predictions_observed": self.probability.count,
+                "features": {
+                    **{name: self._compare_bins(sketch, baseline["numeric"].get(name)) for name, sketch in self.numeric.items()},
+                    **{name: self._compare_categories(sketch, baseline["categorical"].get(name)) for name, sketch in self.categorical.items()},
+                },
+                "outputs": {
+                    "fertilizer_type": self._compare_categories(self.fertilizer_type, outputs.get("fertilizer_type")),
+                    "quantity": self._compare_bins(self.quantity, outputs.get("quantity")),
+                    "probability": self._compare_bins(self.probability, outputs.get("probability")),
+                },
+            }
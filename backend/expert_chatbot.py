@@ -0,0 +1,221 @@
+"""Rule-based agriculture chatbot with optional per-session follow-up context."""
+import json
+import os
+import re
+
+KB_PATH = "farming_kb.json"
+
+class AgricultureExpertChatbot:
+    def __init__(self, kb_path=KB_PATH):
+        self.knowledge_base = []
+        if os.path.exists(kb_path):
+            with open(kb_path, "r", encoding='utf-8') as f:
+                self.knowledge_base = json.load(f)
+        
+        # Keywords
+        self.soil_keywords = ['soil', 'dirt', 'earth', 'clay', 'loam', 'sand', 'fertility', 'nutrients', 'ph', 'acidity', 'alkaline']
+        self.irrigation_keywords = ['water', 'irrigation', 'watering', 'drip', 'sprinkler', 'flood', 'rain', 'drainage']
+        self.fertilizer_keywords = ['fertilizer', 'fertiliser', 'npk', 'urea', 'dap', 'compost', 'manure', 'nutrient']
+        self.greeting_keywords = ['hi', 'hello', 'hey', 'namaste', 'greetings']
+        self.thanks_keywords = ['thank', 'thanks', 'appreciate']
+
+        # Context words for session follow-ups like "and for wheat?" or "how often?"
+        # A query only counts as a follow-up if it starts with one of these, or is a short
+        # question naming a crop ("wheat?", "for maize")
+        self.follow_up_pattern = re.compile(r'^(?:and|what about|how about|how often|how much|when|also|same)\b')
+        self.follow_up_keywords_te = ['మరి', 'ఎప్పుడు', 'ఎంత']
+        self.max_follow_up_words = 3
+        # English crop names match whole words (so "price" is not "rice"); Telugu names
+        # match as substrings because they take case suffixes (e.g. వరికి = "for rice")
+        self.crop_patterns = [
+            (re.compile(r'\b' + re.escape(keyword) + r'(?:e?s)?\b'), crop)
+            for keyword, crop in {
+                'rice': 'rice', 'paddy': 'rice', 'wheat': 'wheat', 'maize': 'maize', 'corn': 'maize',
+                'cotton': 'cotton', 'groundnut': 'groundnut', 'sugarcane': 'sugarcane', 'potato': 'potato', 'tomato': 'tomato',
+            }.items()
+        ]
+        self.crop_keywords_te = {'వరి': 'rice', 'గోధుమ': 'wheat', 'మొక్కజొన్న': 'maize', 'పత్తి': 'cotton', 'వేరుశనగ': 'groundnut', 'చెరకు': 'sugarcane'}
+
+    def detect_language(self, query):
+        # Telugu Unicode range is \u0C00-\u0C7F
+        for char in query:
+            if '\u0C00' <= char <= '\u0C7F':
+                return 'te'
+        return 'en'
+
+    def classify_question(self, query, language='en'):
+        query_lower = query.lower()
+        
+        # Check tokens based on detected language
+        if language == 'te':
+            if any(w in query_lower for w in ['హలో', 'నమస్తే', 'హాయ్']): return 'greeting'
+            if any(w in query_lower for w in ['ధన్యవాదాలు', 'థాంక్స్']): return 'thanks'
+            if any(w in query_lower for w in ['నీరు', 'తడి', 'వర్షం']): return 'irrigation'
+            if any(w in query_lower for w in ['ఎరువు', 'బలం']): return 'fertilizer'
+            if any(w in query_lower for w in ['నేల', 'మట్టి']): return 'soil'
+        else:
+            if any(w in query_lower for w in self.greeting_keywords): return 'greeting'
+            if any(w in query_lower for w in self.thanks_keywords): return 'thanks'
+            if any(w in query_lower for w in self.irrigation_keywords): return 'irrigation'
+            if any(w in query_lower for w in self.fertilizer_keywords): return 'fertilizer'
+            if any(w in query_lower for w in self.soil_keywords): return 'soil'
+        
+        return 'general'
+
+    def extract_crop(self, query):
+        query_lower = query.lower()
+        for pattern, crop in self.crop_patterns:
+            if pattern.search(query_lower):
+                return crop
+        for keyword, crop in self.crop_keywords_te.items():
+            if keyword in query_lower:
+                return crop
+        return None
+
+    def is_follow_up(self, query):
+        """Starts with a follow-up phrase ("and for wheat?", "how often?") or is a short crop-only question.
+
+        Only called for queries already classified 'general', i.e. without topic keywords.
+        Other short questions ("who are you") are not follow-ups.
+        """
+        query_lower = query.lower().strip()
+        if self.follow_up_pattern.match(query_lower):
+            return True
+        if any(query_lower.startswith(w) for w in self.follow_up_keywords_te):
+            return True
+        return len(query_lower.split()) <= self.max_follow_up_words and self.extract_crop(query) is not None
+
+    def resolve_context(self, query, topic, session):
+        """Carry topic and crop over from the session for follow-up questions.
+
+        Returns (topic, crop). The query text is left as asked; the remembered crop is
+        passed to the generators separately so it never outweighs what the user typed.
+        """
+        crop = self.extract_crop(query)
+        if topic == 'general' and session.last_topic in ('soil', 'irrigation', 'fertilizer'):
+            if self.is_follow_up(query):
+                topic = session.last_topic
+        if crop is None:
+            crop = session.crop or (session.prediction or {}).get('crop')
+        return topic, crop
+
+    def describe_prediction(self, prediction, language='en'):
+        """One-line reminder of the user's latest /predict result."""
+        if language == 'te':
+            return f"మీ తాజా ప్రణాళిక ప్రకారం {prediction['crop'].capitalize()} పంటకు {prediction['fertilizer']} ఎకరానికి {prediction['quantity']} కిలోలు. "
+        return f"Your latest plan for {prediction['crop'].capitalize()} recommends {prediction['fertilizer']} at {prediction['quantity']} kg/acre. "
+
+    def generate_soil_response(self, query, language='en'):
+        query_lower = query.lower()
+        
+        if language == 'te':
+            if 'ph' in query_lower or 'ఆమ్ల' in query_lower:
+                return "నేల ఆమ్లంగా (తక్కువ pH) ఉంటే సున్నం వేయండి. క్షారంగా (ఎక్కువ pH) ఉంటే జిప్సం వాడండి. దీని వల్ల పంట బాగా పెరుగుతుంది."
+            if 'type' in query_lower or 'రకం' in query_lower:
+                return "నల్లరేగడి నేల పత్తికి మంచిది. ఎర్ర నేల కంది, వేరుశనగకు మంచిది. ఇసుక నేలల్లో నీరు త్వరగా ఇంకిపోతుంది."
+            return "మంచి పంట కోసం నేల పరీక్ష చేయించండి. సేంద్రీయ ఎరువులు వాడితే నేల బలం పెరుగుతుంది. లోతైన దుక్కి చేయండి."
+        else:
+            if 'ph' in query_lower or 'acidity' in query_lower:
+                return "For acidic soil, use lime. For alkaline soil, use gypsum. This balances the soil for better crop growth."
+            if 'type' in query_lower:
+                return "Black soil is good for cotton. Red soil suits groundnut better. Sandy soil drains water quickly."
+            return "Test your soil fertility first. Add organic compost to improve soil health. Deep plowing helps air circulation."
+
+    def generate_irrigation_response(self, query, language='en'):
+        # STRICT RULE: No fertilizer mentions here.
+        query_lower = query.lower()
+        
+        if language == 'te':
+            if 'drip' in query_lower or 'బిందు' in query_lower:
+                return "బిందు సేద్యం (Drip) నీటిని ఆదా చేస్తుంది. ఇది కూరగాయలకు చాలా మంచిది. కలుపు మొక్కలను కూడా తగ్గిస్తుంది."
+            if 'frequency' in query_lower or 'ఎప్పుడు' in query_lower:
+                return "నేల తేమను చూసి నీరు పెట్టండి. వేసవిలో 3 రోజులకు ఒకసారి, చలికాలంలో వారానికి ఒకసారి నీరు ఇవ్వండి."
+            return "పంటకు తగినంత మాత్రమే నీరు ఇవ్వండి. ఎక్కువ నీరు ఇస్తే వేర్లు కుళ్లిపోతాయి. ఉదయం లేదా సాయంత్రం నీరు పెట్టడం మంచిది."
+        else:
+            if 'drip' in query_lower:
+                return "Drip irrigation saves water and reduces weeds. It is excellent for vegetable crops."
+            if 'frequency' in query_lower or 'when' in query_lower or 'how often' in query_lower:
+                return "Check soil moisture before watering. Irrigate every 3 days in summer and weekly in winter."
+            return "Water only when needed. Excess water causes root rot. The best time to water is early morning or evening."
+
+    def generate_fertilizer_response(self, query, language='en', crop=None):
+        # STRICT RULE: Do not recommend Urea always. Mention alternatives (DAP, SSP, etc.). Explain meaning.
+        # `crop` is the session's remembered crop; it only applies when the query has no more specific intent
+        query_lower = query.lower()
+        query_crop = self.extract_crop(query)
+        
+        if language == 'te':
+            if query_crop == 'rice':
+                return "వరికి భాస్వరం (DAP) నాటేటప్పుడు వేయండి. పొటాష్ (MOP) కూడా వేయాలి. నత్రజని (Urea) మాత్రమే వాడవద్దు."
+            if 'organic' in query_lower or 'సేంద్రీయ' in query_lower:
+                return "పశువుల ఎరువు (FYM) లేదా వర్మీకంపోస్ట్ వాడండి. ఇవి భూమిని గుల్లగా చేస్తాయి. వేప పిండి వాడితే పురుగు రాదు."
+            if query_crop is None and crop == 'rice':
+                return "వరికి భాస్వరం (DAP) నాటేటప్పుడు వేయండి. పొటాష్ (MOP) కూడా వేయాలి. నత్రజని (Urea) మాత్రమే వాడవద్దు."
+            return "పంటకు కావాల్సిన పోషకాలను బట్టి ఎరువు వేయండి. DAP అంటే వేర్లు పెరగడానికి సహాయపడుతుంది. పొటాష్ గింజ బరువును పెంచుతుంది. కేవలం యూరియా వాడకండి."
+        else:
+            if query_crop == 'rice':
+                return "For rice, apply DAP (Phosphorus) during planting. Use MOP (Potash) later. Do not rely only on Urea."
+            if 'organic' in query_lower:
+                return "Use Farm Yard Manure (FYM) or Vermicompost. These make the soil soft and fertile. Neem cake prevents pests."
+            if query_crop is None and crop == 'rice':
+                return "For rice, apply DAP (Phosphorus) during planting. Use MOP (Potash) later. Do not rely only on Urea."
+            return "Choose fertilizers based on crop needs. DAP helps root growth. Potash improves grain weight. Avoid using only Urea."
+
+    def generate_general_response(self, query, language='en', name=None, location=None):
+        prefix = ""
+        if name:
+            prefix += f"Hello {name}, "
+        if location:
+            prefix += f"I see you are from {location}. "
+            
+        if language == 'te':
+            return f"{prefix}నేను వ్యవసాయ సహాయకుడిని. పంటలు, నీరు, ఎరువులు లేదా నేల గురించి అడగండి. మీకు సహాయం చేయడానికి సిద్ధంగా ఉన్నాను."
+        return f"{prefix}I am your farming assistant. Ask me about crops, water, fertilizers, or soil. I am here to help you."
+
+    def get_response(self, user_query, language='en', name=None, location=None, session=None):
+        """Main method to get intelligent response. `session` (a SessionState) enables follow-ups."""
+        
+        # STRICT RULE: Use the passed language directly. 
+        # The frontend now strictly controls the language state (en/te).
+        final_lang = language
+        
+        # 1. Classify the question
+        topic = self.classify_question(user_query, final_lang)
+        prefix = ""
+        crop = None
+        if session is not None:
+            topic, crop = self.resolve_context(user_query, topic, session)
+            if topic in ('soil', 'irrigation', 'fertilizer'):
+                session.last_topic = topic
+            session.crop = crop
+            session.language = final_lang
+            prediction = session.prediction
+            if topic == 'fertilizer' and prediction and prediction['crop'] == crop:
+                prefix = self.describe_prediction(prediction, final_lang)
+        
+        # 2. Handle greetings
+        if topic == 'greeting':
+            greeting_msg = ""
+            if final_lang == 'te':
+                greeting_msg = "నమస్కారం! నేను మీ వ్యవసాయ సలహాదారుడిని. నేల, నీటిపారుదల, ఎరువులు లేదా పంటల గురించి అడగండి. నేను సహాయం చేయడానికి ఇక్కడ ఉన్నాను! 🌾"
+            else:
+                greeting_msg = "Hello! I'm your agriculture advisor. Ask me about soil, irrigation, fertilizers, or crops. I'm here to help! 🌾"
+            
+            if name:
+                return f"{name}, {greeting_msg}"
+            return greeting_msg
+        
+        if topic == 'thanks':
+            if final_lang == 'te':
+                return "స్వాగతం! విజయవంతమైన వ్యవసాయం కోసం శుభాకాంక్షలు! ఇంకా ప్రశ్నలు ఉంటే అడగండి. 🌱"
+            return "You're welcome! Wishing you successful farming! Feel free to ask more questions. 🌱"
+        
+        # 3. Generate contextual response based on question type
+        if topic == 'soil':
+            return self.generate_soil_response(user_query, final_lang)
+        elif topic == 'irrigation':
+            return self.generate_irrigation_response(user_query, final_lang)
+        elif topic == 'fertilizer':
+            return prefix + self.generate_fertilizer_response(user_query, final_lang, crop)
+        else:
+            return self.generate_general_response(user_query, final_lang, name, location)
@@ -0,0 +1,256 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    farmer TEXT,
+    location TEXT,
+    crop TEXT,
+    created_at REAL NOT NULL,
+    model_version TEXT,
+    inputs TEXT NOT NULL,
+    outputs TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_records_farmer ON records (farmer, created_at);
+CREATE INDEX IF NOT EXISTS idx_records_location ON records (location, created_at);
+CREATE INDEX IF NOT EXISTS idx_records_crop ON records (crop, created_at);
+CREATE INDEX IF NOT EXISTS idx_records_created ON records (created_at);
+"""
+
+COLUMNS = ('id', 'kind', 'farmer', 'location', 'crop', 'created_at', 'model_version', 'inputs', 'outputs')
+
+
+def normalize_key(value):
+    """Farmer/location/crop are matched case-insensitively."""
+    if value is None:
+        return None
+    value = str(value).strip().lower()
+    return value or None
+
+
+class HistoryStore:
+    """Embedded SQLite (WAL mode) history of predictions and chat turns.
+
+    `record()` only enqueues the row and returns its ID, so the request path never
+    waits on disk. A single writer thread commits queued rows in batches and
+    periodically compacts the database (retention delete + WAL checkpoint + vacuum).
+    Reads use their own connections, which WAL lets run alongside the writer.
+    """
+
+    def __init__(self, db_path, batch_size=200, flush_interval=0.5, max_queue=10000,
+                 retention_days=3 * 365, compact_interval=3600):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+        self.compact_interval = compact_interval
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        # Rows accepted but not yet committed, so get() can see them immediately
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.written = 0
+        self.last_compaction = None
+
+        self._init_db()
+        self._writer = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            # auto_vacuum must be chosen before the first table is created
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(SCHEMA)
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ---- Writes ----
+
+    def record(self, kind, inputs, outputs, farmer=None, location=None, crop=None, model_version=None):
+        """Queue a record and return its ID without touching disk."""
+        record_id = uuid.uuid4().hex
+        row = (
+            record_id, kind, normalize_key(farmer), normalize_key(location), normalize_key(crop),
+            time.time(), model_version,
+            json.dumps(inputs, ensure_ascii=False, default=str),
+            json.dumps(outputs, ensure_ascii=False, default=str),
+        )
+        with self._lock:
+            self._pending[record_id] = row
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            # Never block a request on a backed-up disk; losing history is preferable
+            with self._lock:
+                self._pending.pop(record_id, None)
+                self.dropped += 1
+            return None
+        return record_id
+
+    def _next_batch(self):
+        """Wait up to flush_interval for a first item, then collect more until the batch deadline."""
+        batch = []
+        try:
+            item = self._queue.get(timeout=self.flush_interval)
+            batch.append(item)
+            deadline = time.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                batch.append(self._queue.get(timeout=remaining))
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self):
+        conn = self._connect()
+        conn.execute("PRAGMA synchronous = NORMAL")
+        next_compaction = time.time() + self.compact_interval
+        while True:
+            batch = self._next_batch()
+            stop = None in batch
+            rows = [row for row in batch if row is not None]
+            # Any exception escaping here would kill the writer: flush() would then hang
+            # forever and every later record would be dropped once the queue filled up
+            try:
+                if rows:
+                    self._write_batch(conn, rows)
+            except Exception:
+                self._log_error("History write error")
+                with self._lock:
+                    for row in rows:
+                        self._pending.pop(row[0], None)
+                    self.dropped += len(rows)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                break
+
+            if time.time() >= next_compaction:
+                next_compaction = time.time() + self.compact_interval
+                try:
+                    self._compact(conn)
+                except Exception:
+                    self._log_error("History compaction error")
+        conn.close()
+
+    @staticmethod
+    def _log_error(message):
+        print(f"{message}:")
+        traceback.print_exc()
+
+    def _write_batch(self, conn, rows):
+        try:
+            with conn:
+                conn.executemany(f"INSERT OR REPLACE INTO records ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", rows)
+            self.written += len(rows)
+        except sqlite3.Error as e:
+            print(f"History write error: {e}")
+        finally:
+            with self._lock:
+                for row in rows:
+                    self._pending.pop(row[0], None)
+
+    def _compact(self, conn):
+        try:
+            cutoff = time.time() - self.retention_days * 86400
+            with conn:
+                conn.execute("DELETE FROM records WHERE created_at < ?", (cutoff,))
+            conn.execute("PRAGMA incremental_vacuum")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.last_compaction = time.time()
+        except sqlite3.Error as e:
+            print(f"History compaction error: {e}")
+
+    def flush(self):
+        """Block until every queued record is committed."""
+        self._queue.join()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    # ---- Reads ----
+
+    @staticmethod
+    def _to_dict(row):
+        record = dict(zip(COLUMNS, tuple(row)))
+        record['inputs'] = json.loads(record['inputs'])
+        record['outputs'] = json.loads(record['outputs'])
+        record['created_at'] = datetime.fromtimestamp(record['created_at']).isoformat(timespec='seconds')
+        return record
+
+    def get(self, record_id):
+        with self._lock:
+            row = self._pending.get(record_id)
+        if row is not None:
+            return self._to_dict(row)
+
+        conn = self._connect()
+        try:
+            row = conn.execute(f"SELECT {', '.join(COLUMNS)} FROM records WHERE id = ?", (record_id,)).fetchone()
+        finally:
+            conn.close()
+        return self._to_dict(row) if row else None
+
+    def query(self, farmer=None, location=None, crop=None, kind=None, since=None, until=None, limit=100):
+        """Newest-first records matching every given filter. `since`/`until` are epoch seconds."""
+        clauses, params = [], []
+        for column, value in (('farmer', farmer), ('location', location), ('crop', crop)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(normalize_key(value))
+        if kind is not None:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+
+        sql = f"SELECT {', '.join(COLUMNS)} FROM records"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        return [self._to_dict(row) for row in rows]
+
+    def stats(self):
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "last_compaction": datetime.fromtimestamp(self.last_compaction).isoformat(timespec='seconds') if self.last_compaction else None,
+        }
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # Stop nginx-style proxies from buffering the stream
+}
+
+
+def format_sse(event, data, event_id=None):
+    """Encode one server-sent event."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False, default=str))
+    return "\n".join(lines) + "\n\n"
+
+
+class Job:
+    """A background job and the ordered log of events it has emitted.
+
+    Events can carry a smaller `retained` payload. Once the job finishes, that
+    payload replaces the full one, so finished jobs kept for late readers hold
+    summaries rather than every partial result.
+    """
+
+    def __init__(self, kind, total, files_dir):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.total = total
+        self.completed = 0
+        self.status = 'queued'
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.events = []  # (event, data, retained)
+        # Downloads are written to disk rather than kept in memory: index -> file path
+        self.files_dir = os.path.join(files_dir, self.id)
+        self.files = {}
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'failed')
+
+    def emit(self, event, data, retained=None):
+        with self._lock:
+            self.events.append((event, data, retained))
+
+    def finish(self, error=None):
+        # Status and the final event change together so streams never stop before it
+        with self._lock:
+            self.error = error
+            self.status = 'failed' if error else 'done'
+            self.finished_at = time.time()
+            self.events = [
+                (event, data if retained is None else retained, None)
+                for event, data, retained in self.events
+            ]
+            self.events.append(('error' if error else 'done', self.snapshot(), None))
+
+    def read_events(self, start):
+        """(events from index `start`, finished) as one consistent snapshot."""
+        with self._lock:
+            return self.events[start:], self.finished
+
+    def save_file(self, index, data, suffix=''):
+        os.makedirs(self.files_dir, exist_ok=True)
+        path = os.path.join(self.files_dir, f"{index}{suffix}")
+        with open(path, 'wb') as f:
+            f.write(data)
+        self.files[index] = path
+
+    def delete_files(self):
+        self.files = {}
+        shutil.rmtree(self.files_dir, ignore_errors=True)
+
+    def progress(self, completed):
+        self.completed = completed
+        self.emit('progress', {"completed": completed, "total": self.total})
+
+    def snapshot(self):
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "completed": self.completed,
+            "total": self.total,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """Runs jobs on a small thread pool and keeps finished jobs for `retention_seconds`.
+
+    Job files live under `files_dir` (a fresh temporary directory by default) and are
+    deleted together with the job.
+    """
+
+    def __init__(self, max_workers=2, max_jobs=100, retention_seconds=3600, files_dir=None):
+        self.max_jobs = max_jobs
+        self.retention_seconds = retention_seconds
+        self.files_dir = files_dir or tempfile.mkdtemp(prefix="fertilizer-jobs-")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _prune(self):
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            expired = job.finished and now - job.finished_at > self.retention_seconds
+            if expired or (len(self._jobs) >= self.max_jobs and job.finished):
+                del self._jobs[job_id]
+                job.delete_files()
+
+    def submit(self, kind, total, target, *args):
+        """Start `target(job, *args)` in the background. Returns None when at capacity."""
+        job = Job(kind, total, self.files_dir)
+        with self._lock:
+            self._prune()
+            if len(self._jobs) >= self.max_jobs:
+                return None
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, target, args)
+        return job
+
+    def _run(self, job, target, args):
+        job.status = 'running'
+        job.emit('status', job.snapshot())
+        try:
+            target(job, *args)
+        except Exception as e:
+            job.finish(error=getattr(e, 'detail', None) or str(e))
+        else:
+            job.finish()
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    async def stream(self, job, start=0, heartbeat=15, poll_interval=0.2):
+        """Yield the job's events as SSE from index `start` until it finishes.
+
+        Event IDs are log indexes, so a client can resume with Last-Event-ID.
+        Events read after the job finished carry their retained (compact) payload.
+        The log is polled with asyncio.sleep, so an open stream never holds a worker
+        thread that the sync endpoints need.
+        """
+        index = start
+        idle = 0.0
+        while True:
+            pending, finished = job.read_events(index)
+            for event, data, _ in pending:
+                yield format_sse(event, data, index)
+                index += 1
+            if pending:
+                idle = 0.0
+                continue
+            if finished:
+                return
+            if idle >= heartbeat:
+                yield ": keep-alive\n\n"
+                idle = 0.0
+            await asyncio.sleep(poll_interval)
+            idle += poll_interval
+
+    def close(self):
+        """Remove every job's files (called at shutdown)."""
+        shutil.rmtree(self.files_dir, ignore_errors=True)
@@ -1,5 +1,11 @@
-from fastapi import FastAPI, HTTPException, Body
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Body, Request
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Union
+import itertools
+import math
+import re
+import hashlib
+import hmac
 import pandas as pd
 import numpy as np
 import tensorflow as tf
@@ -8,8 +14,26 @@ import os
 from fastapi.middleware.cors import CORSMiddleware
 import json
 from fpdf import FPDF
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse, Response
 import io
+import atexit
+from datetime import datetime
+from history_store import HistoryStore
+from session_store import SessionStore, MAX_SESSION_ID_LENGTH
+from jobs import JobManager, SSE_HEADERS, format_sse
+from drift_monitor import DriftMonitor
+from expert_chatbot import AgricultureExpertChatbot
+from advisory import (
+    INSIGHTS, RESPONSE_MODES, STRING_TABLE, STRINGS_VERSION,
+    get_crop_specific_fertilizer, get_irrigation_guidance, shape_prediction, strings_etag,
+)
+from compression import MIN_COMPRESS_BYTES, compress, etag_matches, negotiate_encoding
+
+# Optional fast-path dependency; the API works without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 app = FastAPI(title="Smart Fertilizer Advisor API")
 
@@ -26,18 +50,40 @@ app.add_middleware(
 MODEL_PATH = "fertilizer_model.keras"
 PREPROCESSOR_PATH = "preprocessor.pkl"
 ENCODER_PATH = "label_encoder.pkl"
+HISTORY_DB_PATH = "history.db"
+DRIFT_BASELINE_PATH = "drift_baseline.json"  # Written by build_drift_baseline.py / train_model.py
+# When set, the history endpoints require "Authorization: Bearer <token>"
+HISTORY_API_TOKEN = os.environ.get("HISTORY_API_TOKEN")
+
+# Feature columns the preprocessor was fitted on (see train_model.py)
+NUMERIC_FEATURES = ['Soil_N', 'Soil_P', 'Soil_K', 'Soil_pH', 'Soil_Moisture']
+CATEGORICAL_FEATURES = ['Crop_Name', 'Season']
+FEATURE_COLUMNS = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+
+# Upper bound on grid points evaluated by a single /predict/sweep call
+MAX_SWEEP_POINTS = 5000
+MAX_SWEEP_STEPS = 200  # Per axis, for both ranges and value lists
+
+# Background job limits (/jobs/*); batch predictions run through the model in chunks
+MAX_BATCH_ITEMS = 5000
+BATCH_CHUNK_SIZE = 256
+MAX_REPORT_JOB_ITEMS = 200
 
 model = None
 preprocessor = None
 label_encoder = None
+MODEL_VERSION = None
 
 def load_artifacts():
-    global model, preprocessor, label_encoder
+    global model, preprocessor, label_encoder, MODEL_VERSION
     if os.path.exists(MODEL_PATH) and os.path.exists(PREPROCESSOR_PATH) and os.path.exists(ENCODER_PATH):
         try:
             model = tf.keras.models.load_model(MODEL_PATH)
             preprocessor = joblib.load(PREPROCESSOR_PATH)
             label_encoder = joblib.load(ENCODER_PATH)
+            # Short content hash so stored history can be traced to the exact model file
+            with open(MODEL_PATH, "rb") as f:
+                MODEL_VERSION = hashlib.sha1(f.read()).hexdigest()[:12]
             print("Artifacts loaded successfully.")
         except Exception as e:
             print(f"Error loading artifacts: {e}")
@@ -46,147 +92,32 @@ def load_artifacts():
 
 load_artifacts()
 
-# Smart Agriculture Expert Chatbot
-KB_PATH = "farming_kb.json"
-
-class AgricultureExpertChatbot:
-    def __init__(self, kb_path=KB_PATH):
-        self.knowledge_base = []
-        if os.path.exists(kb_path):
-            with open(kb_path, "r", encoding='utf-8') as f:
-                self.knowledge_base = json.load(f)
-        
-        # Keywords
-        self.soil_keywords = ['soil', 'dirt', 'earth', 'clay', 'loam', 'sand', 'fertility', 'nutrients', 'ph', 'acidity', 'alkaline']
-        self.irrigation_keywords = ['water', 'irrigation', 'watering', 'drip', 'sprinkler', 'flood', 'rain', 'drainage']
-        self.fertilizer_keywords = ['fertilizer', 'fertiliser', 'npk', 'urea', 'dap', 'compost', 'manure', 'nutrient']
-        self.greeting_keywords = ['hi', 'hello', 'hey', 'namaste', 'greetings']
-        self.thanks_keywords = ['thank', 'thanks', 'appreciate']
-
-    def detect_language(self, query):
-        # Telugu Unicode range is \u0C00-\u0C7F
-        for char in query:
-            if '\u0C00' <= char <= '\u0C7F':
-                return 'te'
-        return 'en'
-
-    def classify_question(self, query, language='en'):
-        query_lower = query.lower()
-        
-        # Check tokens based on detected language
-        if language == 'te':
-            if any(w in query_lower for w in ['హలో', 'నమస్తే', 'హాయ్']): return 'greeting'
-            if any(w in query_lower for w in ['ధన్యవాదాలు', 'థాంక్స్']): return 'thanks'
-            if any(w in query_lower for w in ['నీరు', 'తడి', 'వర్షం']): return 'irrigation'
-            if any(w in query_lower for w in ['ఎరువు', 'బలం']): return 'fertilizer'
-            if any(w in query_lower for w in ['నేల', 'మట్టి']): return 'soil'
-        else:
-            if any(w in query_lower for w in self.greeting_keywords): return 'greeting'
-            if any(w in query_lower for w in self.thanks_keywords): return 'thanks'
-            if any(w in query_lower for w in self.irrigation_keywords): return 'irrigation'
-            if any(w in query_lower for w in self.fertilizer_keywords): return 'fertilizer'
-            if any(w in query_lower for w in self.soil_keywords): return 'soil'
-        
-        return 'general'
+# Prediction / chat history (writes are batched on a background thread)
+history = HistoryStore(HISTORY_DB_PATH)
+atexit.register(history.close)
 
-    def generate_soil_response(self, query, language='en'):
-        query_lower = query.lower()
-        
-        if language == 'te':
-            if 'ph' in query_lower or 'ఆమ్ల' in query_lower:
-                return "నేల ఆమ్లంగా (తక్కువ pH) ఉంటే సున్నం వేయండి. క్షారంగా (ఎక్కువ pH) ఉంటే జిప్సం వాడండి. దీని వల్ల పంట బాగా పెరుగుతుంది."
-            if 'type' in query_lower or 'రకం' in query_lower:
-                return "నల్లరేగడి నేల పత్తికి మంచిది. ఎర్ర నేల కంది, వేరుశనగకు మంచిది. ఇసుక నేలల్లో నీరు త్వరగా ఇంకిపోతుంది."
-            return "మంచి పంట కోసం నేల పరీక్ష చేయించండి. సేంద్రీయ ఎరువులు వాడితే నేల బలం పెరుగుతుంది. లోతైన దుక్కి చేయండి."
-        else:
-            if 'ph' in query_lower or 'acidity' in query_lower:
-                return "For acidic soil, use lime. For alkaline soil, use gypsum. This balances the soil for better crop growth."
-            if 'type' in query_lower:
-                return "Black soil is good for cotton. Red soil suits groundnut better. Sandy soil drains water quickly."
-            return "Test your soil fertility first. Add organic compost to improve soil health. Deep plowing helps air circulation."
-
-    def generate_irrigation_response(self, query, language='en'):
-        # STRICT RULE: No fertilizer mentions here.
-        query_lower = query.lower()
-        
-        if language == 'te':
-            if 'drip' in query_lower or 'బిందు' in query_lower:
-                return "బిందు సేద్యం (Drip) నీటిని ఆదా చేస్తుంది. ఇది కూరగాయలకు చాలా మంచిది. కలుపు మొక్కలను కూడా తగ్గిస్తుంది."
-            if 'frequency' in query_lower or 'ఎప్పుడు' in query_lower:
-                return "నేల తేమను చూసి నీరు పెట్టండి. వేసవిలో 3 రోజులకు ఒకసారి, చలికాలంలో వారానికి ఒకసారి నీరు ఇవ్వండి."
-            return "పంటకు తగినంత మాత్రమే నీరు ఇవ్వండి. ఎక్కువ నీరు ఇస్తే వేర్లు కుళ్లిపోతాయి. ఉదయం లేదా సాయంత్రం నీరు పెట్టడం మంచిది."
-        else:
-            if 'drip' in query_lower:
-                return "Drip irrigation saves water and reduces weeds. It is excellent for vegetable crops."
-            if 'frequency' in query_lower or 'when' in query_lower:
-                return "Check soil moisture before watering. Irrigate every 3 days in summer and weekly in winter."
-            return "Water only when needed. Excess water causes root rot. The best time to water is early morning or evening."
-
-    def generate_fertilizer_response(self, query, language='en'):
-        # STRICT RULE: Do not recommend Urea always. Mention alternatives (DAP, SSP, etc.). Explain meaning.
-        query_lower = query.lower()
-        
-        if language == 'te':
-            if 'rice' in query_lower or 'వరి' in query_lower:
-                return "వరికి భాస్వరం (DAP) నాటేటప్పుడు వేయండి. పొటాష్ (MOP) కూడా వేయాలి. నత్రజని (Urea) మాత్రమే వాడవద్దు."
-            if 'organic' in query_lower or 'సేంద్రీయ' in query_lower:
-                return "పశువుల ఎరువు (FYM) లేదా వర్మీకంపోస్ట్ వాడండి. ఇవి భూమిని గుల్లగా చేస్తాయి. వేప పిండి వాడితే పురుగు రాదు."
-            return "పంటకు కావాల్సిన పోషకాలను బట్టి ఎరువు వేయండి. DAP అంటే వేర్లు పెరగడానికి సహాయపడుతుంది. పొటాష్ గింజ బరువును పెంచుతుంది. కేవలం యూరియా వాడకండి."
-        else:
-            if 'rice' in query_lower:
-                return "For rice, apply DAP (Phosphorus) during planting. Use MOP (Potash) later. Do not rely only on Urea."
-            if 'organic' in query_lower:
-                return "Use Farm Yard Manure (FYM) or Vermicompost. These make the soil soft and fertile. Neem cake prevents pests."
-            return "Choose fertilizers based on crop needs. DAP helps root growth. Potash improves grain weight. Avoid using only Urea."
-
-    def generate_general_response(self, query, language='en', name=None, location=None):
-        prefix = ""
-        if name:
-            prefix += f"Hello {name}, "
-        if location:
-            prefix += f"I see you are from {location}. "
-            
-        if language == 'te':
-            return f"{prefix}నేను వ్యవసాయ సహాయకుడిని. పంటలు, నీరు, ఎరువులు లేదా నేల గురించి అడగండి. మీకు సహాయం చేయడానికి సిద్ధంగా ఉన్నాను."
-        return f"{prefix}I am your farming assistant. Ask me about crops, water, fertilizers, or soil. I am here to help you."
-
-    def get_response(self, user_query, language='en', name=None, location=None):
-        """Main method to get intelligent response"""
-        
-        # STRICT RULE: Use the passed language directly. 
-        # The frontend now strictly controls the language state (en/te).
-        final_lang = language
-        
-        # 1. Classify the question
-        topic = self.classify_question(user_query, final_lang)
-        
-        # 2. Handle greetings
-        if topic == 'greeting':
-            greeting_msg = ""
-            if final_lang == 'te':
-                greeting_msg = "నమస్కారం! నేను మీ వ్యవసాయ సలహాదారుడిని. నేల, నీటిపారుదల, ఎరువులు లేదా పంటల గురించి అడగండి. నేను సహాయం చేయడానికి ఇక్కడ ఉన్నాను! 🌾"
-            else:
-                greeting_msg = "Hello! I'm your agriculture advisor. Ask me about soil, irrigation, fertilizers, or crops. I'm here to help! 🌾"
-            
-            if name:
-                return f"{name}, {greeting_msg}"
-            return greeting_msg
-        
-        if topic == 'thanks':
-            if final_lang == 'te':
-                return "స్వాగతం! విజయవంతమైన వ్యవసాయం కోసం శుభాకాంక్షలు! ఇంకా ప్రశ్నలు ఉంటే అడగండి. 🌱"
-            return "You're welcome! Wishing you successful farming! Feel free to ask more questions. 🌱"
-        
-        # 3. Generate contextual response based on question type
-        if topic == 'soil':
-            return self.generate_soil_response(user_query, final_lang)
-        elif topic == 'irrigation':
-            return self.generate_irrigation_response(user_query, final_lang)
-        elif topic == 'fertilizer':
-            return self.generate_fertilizer_response(user_query, final_lang)
-        else:
-            return self.generate_general_response(user_query, final_lang, name, location)
+# Per-session chat context (bounded LRU with idle expiry)
+sessions = SessionStore(max_sessions=20000, ttl_seconds=1800)
+
+# Batch predictions and bulk reports run here instead of inside the HTTP request
+jobs = JobManager(max_workers=2)
+atexit.register(jobs.close)
 
+def create_drift_monitor():
+    # Categories the fitted OneHotEncoder knows; anything else encodes as all zeros
+    known_categories = {}
+    if preprocessor is not None:
+        try:
+            encoder = preprocessor.named_transformers_['cat']
+            known_categories = {name: [str(c) for c in cats] for name, cats in zip(CATEGORICAL_FEATURES, encoder.categories_)}
+        except (AttributeError, KeyError) as e:
+            print(f"Could not read encoder categories: {e}")
+    return DriftMonitor.from_file(DRIFT_BASELINE_PATH, NUMERIC_FEATURES, CATEGORICAL_FEATURES, known_categories)
+
+# Live input/output distributions compared against the training baseline
+drift_monitor = create_drift_monitor()
+
+# Smart Agriculture Expert Chatbot
 chatbot = AgricultureExpertChatbot()
 
 # Input Schema
@@ -200,170 +131,162 @@ class FertilizerInput(BaseModel):
     Season: str
     landArea: float = 1.0  # Optional, default 1 acre
     language: str = 'en' # Added to support language-specific generation
+    response_mode: str = 'full'  # 'full' (bilingual), 'language' (requested language only) or 'compact' (string IDs, see /strings)
+    farmer_name: Optional[str] = None  # Used to index stored history
+    location: Optional[str] = None
+    session_id: Optional[str] = Field(None, max_length=MAX_SESSION_ID_LENGTH)  # Chat session to link this prediction to
+
+class SweepRange(BaseModel):
+    start: float
+    stop: float
+    steps: int = 10  # Number of evenly spaced points, both ends included
+
+class SweepInput(BaseModel):
+    base: FertilizerInput
+    ranges: Dict[str, SweepRange] = {}  # Numeric fields, e.g. {"Soil_pH": {"start": 5.0, "stop": 8.5, "steps": 8}}
+    values: Dict[str, List[Union[float, str]]] = {}  # Explicit lists, e.g. {"Crop_Name": ["Rice", "Wheat"]}
+
+class BatchPredictInput(BaseModel):
+    items: List[FertilizerInput]
+
+class ReportJobInput(BaseModel):
+    record_ids: List[str]  # record_id values returned by /predict
 
 class ChatInput(BaseModel):
     query: str
     language: str = 'en'
     name: str = None
     location: str = None
+    session_id: Optional[str] = Field(None, max_length=MAX_SESSION_ID_LENGTH)  # Enables follow-up questions; omit for stateless replies
+    prediction_id: Optional[str] = None  # record_id of the user's latest /predict result
 
 @app.get("/")
 def home():
     return {"message": "Smart Fertilizer Recommendation API is running."}
 
-# Crop-Specific Fertilizer Recommendations
-def get_crop_specific_fertilizer(crop_name, soil_n, soil_p, soil_k, soil_ph, predicted_type):
-    """Generate crop-specific fertilizer recommendations based on crop requirements"""
-    
-    crop_lower = crop_name.lower()
-    
-    # English DB
-    crop_fertilizers_en = {
-        'rice': {'primary': 'Urea', 'purpose': 'High nitrogen requirement for vegetative growth and tillering', 'secondary': 'DAP for phosphorus during transplanting, MOP for grain filling'},
-        'wheat': {'primary': 'DAP', 'purpose': 'Balanced NPK with emphasis on phosphorus for root development', 'secondary': 'Urea for top dressing at crown root stage'},
-        'maize': {'primary': 'NPK Complex (12:32:16)', 'purpose': 'Balanced nutrition for rapid growth and cob development', 'secondary': 'Urea for side dressing at knee-high stage'},
-        # Add basic fallbacks for others to avoid key errors if using raw dictionaries
-    }
-
-    # Telugu DB ( Simplified for Farmer Friendliness )
-    crop_fertilizers_te = {
-        'rice': {'primary': 'యూరియా (Urea)', 'purpose': 'మొక్క బాగా పెరగడానికి నత్రజని అవసరం.', 'secondary': 'నాటేటప్పుడు DAP వేయండి. గింజ గట్టిపడటానికి పొటాష్ (MOP) వాడండి.'},
-        'wheat': {'primary': 'DAP', 'purpose': 'వేర్లు బలంగా ఉండటానికి బాగుంటుంది.', 'secondary': 'పైపాటుగా యూరియా వేయవచ్చు.'},
-        'maize': {'primary': 'NPK కాంప్లెక్స్ (12:32:16)', 'purpose': 'కంకి బాగా రావడానికి ఇది ముఖ్యం.', 'secondary': 'మోకాలి ఎత్తు దశలో యూరియా వేయండి.'},
-    }
-
-    # Default Logic for fallback
-    # We will compute the default English recommendation first, then try to find Telugu equivalent or generate generic Telugu.
-    
-    # Original logic adapted for bilingual return
-    fertilizer = predicted_type
-    purpose_en = f'Recommended for {crop_name}'
-    additional_en = 'Consult local expert.'
-    
-    purpose_te = f'{crop_name} పంటకు సిఫార్సు.'
-    additional_te = 'స్థానిక వ్యవసాయ అధికారిని సంప్రదించండి.'
-
-    # Check Crop DB EN
-    if crop_lower in crop_fertilizers_en:
-        info = crop_fertilizers_en[crop_lower]
-        fertilizer = info['primary'] # Keep main logic on English keys mostly or replicate
-        # Adjust logic... (keeping simple for brevity, logic was: check soil)
-        if soil_n < 50 and 'nitrogen' in info['purpose'].lower(): fertilizer = info['primary']
-        # ... logic unchanged ...
-        
-        purpose_en = info['purpose']
-        additional_en = info['secondary']
-
-    # Check Crop DB TE (If available, else generic translation)
-    if crop_lower in crop_fertilizers_te:
-        info_te = crop_fertilizers_te[crop_lower]
-        purpose_te = info_te['purpose']
-        additional_te = info_te['secondary']
-    else:
-        # Generic Telugu fallback if specific crop not in manual DB
-        purpose_te = "మంచి దిగుబడి కోసం ఈ ఎరువు వాడండి."
-        additional_te = "తగినంత తేమ ఉండేలా చూసుకోండి."
-
+# Fast JSON serialization for the hot endpoints
+def _json_default(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_json(content):
+    if orjson is not None:
+        return orjson.dumps(content, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, separators=(',', ':'), default=_json_default).encode('utf-8')
+
+def compress_body(body, request):
+    """Compress `body` with brotli or gzip if the client accepts it. Returns (body, encoding or None)."""
+    if request is None or len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    encoding = negotiate_encoding(request.headers.get('accept-encoding'))
+    return compress(body, encoding), encoding
+
+def fast_json_response(content, request=None, status_code=200, headers=None):
+    """Serialize `content` directly (skipping FastAPI's jsonable_encoder) and
+    compress it with brotli or gzip when the client advertises support."""
+    body, encoding = compress_body(dumps_json(content), request)
+    headers = dict(headers or {})
+    # The body may differ by Accept-Encoding even when this one was sent uncompressed
+    headers['Vary'] = 'Accept-Encoding'
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+def summarize_prediction(record_id, crop_name, result):
+    """The few /predict fields a chat session keeps for context."""
     return {
-        'fertilizer': fertilizer,
-        'purpose': {'en': purpose_en, 'te': purpose_te},
-        'additional': {'en': additional_en, 'te': additional_te}
+        'record_id': record_id,
+        'crop': crop_name.lower(),
+        'fertilizer': result['Recommended_Fertilizer_Type'],
+        'quantity': result['Fertilizer_Quantity_kg_per_acre'],
     }
 
-# Crop-Specific Irrigation Guidance
-def get_irrigation_guidance(crop_name, season, soil_moisture):
-    """Generate crop-specific irrigation recommendations"""
-    
-    crop_lower = crop_name.lower()
-    
-    # English Guide
-    guide_en = {
-        'method': 'Drip or Sprinkler',
-        'timing': 'Based on crop stage',
-        'frequency': 'When soil is dry',
-        'tips': 'Maintain moisture.'
-    }
-    
-    # Telugu Guide
-    guide_te = {
-        'method': 'బిందు సేద్యం (Drip) లేదా స్పింక్లర్',
-        'timing': 'పంట దశను బట్టి',
-        'frequency': 'నేల ఆరినప్పుడు',
-        'tips': 'తేమ ఉండేలా చూసుకోండి.'
-    }
-
-    # Specific Overrides (Example for Rice)
-    if crop_lower == 'rice':
-        guide_en = {
-             'method': 'Flood irrigation', 'timing': 'Continuous water', 'frequency': 'Always wet', 'tips': 'Drain before harvest.'
-        }
-        guide_te = {
-            'method': 'కాలువ ద్వారా నీరు', 'timing': 'పొలం ఎప్పుడూ తడిగా ఉండాలి', 'frequency': 'నిరంతరం', 'tips': 'కోతకు వారం ముందు నీరు తీసేయండి.'
-        }
-    elif crop_lower == 'maize':
-        guide_en = {'method': 'Drip/Furrow', 'timing': 'Knee-high stage', 'frequency': '7-10 days', 'tips': 'Avoid water stress.'}
-        guide_te = {'method': 'బిందు సేద్యం/కాలువ', 'timing': 'మోకాలి ఎత్తు దశలో', 'frequency': '7-10 రోజులకు ఒకసారి', 'tips': 'నీటి ఎద్దడి లేకుండా చూడండి.'}
-    
-    # Adjust based on moisture
-    moisture_note_en = ""
-    moisture_note_te = ""
-    if soil_moisture < 20:
-        moisture_note_en = " Warning: Moisture low!"
-        moisture_note_te = " హెచ్చరిక: తేమ తక్కువగా ఉంది!"
-    
-    return {
-        'method': {'en': guide_en['method'], 'te': guide_te['method']},
-        'timing': {'en': guide_en['timing'], 'te': guide_te['timing']},
-        'frequency': {'en': guide_en['frequency'], 'te': guide_te['frequency']},
-        'tips': {'en': guide_en['tips'] + moisture_note_en, 'te': guide_te['tips'] + moisture_note_te}
-    }
+def run_model(input_df):
+    """Encode a frame of FEATURE_COLUMNS rows and run one batched model pass.
 
-@app.post("/predict")
-def predict_fertilizer(data: FertilizerInput):
+    Returns (ml_types, quantities, probabilities) as arrays aligned with the rows.
+    """
     if not model or not preprocessor or not label_encoder:
         raise HTTPException(status_code=500, detail="Model logic not initialized. Run training first.")
 
-    # 1. Prepare Input
-    input_df = pd.DataFrame([data.dict(exclude={'landArea', 'language'})])
-    
-    # 2. Preprocess
     try:
-        processed_input = preprocessor.transform(input_df)
+        processed_input = preprocessor.transform(input_df[FEATURE_COLUMNS])
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Preprocessing error: {str(e)}")
 
-    # 3. Predict
-    predictions = model.predict(processed_input)
-    predicted_type_idx = np.argmax(predictions[0], axis=1)[0]
-    ml_predicted_type = label_encoder.inverse_transform([predicted_type_idx])[0]
-    quantity = max(0, float(predictions[1][0][0]))
-    success_prob = min(max(float(predictions[2][0][0]), 0), 1)
+    # Pass a batch size so large grids are not split into keras' default 32-row batches
+    predictions = model.predict(processed_input, batch_size=max(32, min(len(input_df), 1024)), verbose=0)
+    ml_types = label_encoder.inverse_transform(np.argmax(predictions[0], axis=1))
+    quantities = np.maximum(predictions[1][:, 0].astype(float), 0)
+    probabilities = np.clip(predictions[2][:, 0].astype(float), 0, 1)
+    return ml_types, quantities, probabilities
+
+@app.get("/strings")
+def get_strings(request: Request, language: str = None):
+    """Static advisory string table referenced by compact /predict responses.
+
+    The table only changes when the server is updated, so clients can cache it
+    and revalidate with If-None-Match.
+    """
+    if language is not None and language not in ('en', 'te'):
+        raise HTTPException(status_code=400, detail="language must be 'en' or 'te'.")
+
+    # Each encoding is a different representation, so it gets its own ETag. The table is
+    # always well above MIN_COMPRESS_BYTES, so the encoding is known before serializing
+    encoding = negotiate_encoding(request.headers.get('accept-encoding'))
+    etag = strings_etag(language, encoding)
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=86400", "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+
+    strings = STRING_TABLE if language is None else {string_id: text[language] for string_id, text in STRING_TABLE.items()}
+    body = compress(dumps_json({"version": STRINGS_VERSION, "strings": strings}), encoding)
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@app.post("/predict")
+def predict_fertilizer(data: FertilizerInput, request: Request):
+    if data.response_mode not in RESPONSE_MODES:
+        raise HTTPException(status_code=400, detail=f"response_mode must be one of {RESPONSE_MODES}.")
+
+    # 1. Prepare Input
+    input_df = pd.DataFrame([data.dict(include=set(FEATURE_COLUMNS))])
+
+    # 2. Preprocess & 3. Predict
+    ml_types, quantities, probabilities = run_model(input_df)
+    drift_monitor.observe(input_df.iloc[0], ml_types[0], quantities[0], probabilities[0])
+
+    result = build_prediction(data, ml_types[0], float(quantities[0]), float(probabilities[0]))
+    store_prediction(data, result)
+    return fast_json_response(shape_prediction(result, data.language, data.response_mode), request)
 
+def build_prediction(data: FertilizerInput, ml_predicted_type, quantity, success_prob):
+    """Turn one row of model output into the bilingual /predict result."""
     # 4. Get Recommendations (Bilingual)
     fert_rec = get_crop_specific_fertilizer(data.Crop_Name, data.Soil_N, data.Soil_P, data.Soil_K, data.Soil_pH, ml_predicted_type)
     irr_rec = get_irrigation_guidance(data.Crop_Name, data.Season, data.Soil_Moisture)
     
     # 5. Rule-based Insights (Bilingual)
-    insights_en = []
-    insights_te = []
-    
+    insight_keys = []
     if data.Soil_N < 50:
-        insights_en.append("Nitrogen is low. Essential for growth.")
-        insights_te.append("నత్రజని తక్కువగా ఉంది. మొక్క పెరుగుదలకు ఇది అవసరం.")
+        insight_keys.append('low_nitrogen')
     if data.Soil_pH < 6.0:
-        insights_en.append("Soil is acidic. Add lime.")
-        insights_te.append("నేల ఆమ్లంగా (పులుపు) ఉంది. సున్నం వేయండి.")
+        insight_keys.append('acidic')
     elif data.Soil_pH > 7.5:
-        insights_en.append("Soil is alkaline. Add gypsum.")
-        insights_te.append("నేల క్షారంగా (ఉప్పు) ఉంది. జిప్సం వాడండి.")
+        insight_keys.append('alkaline')
     if data.Soil_Moisture < 20:
-        insights_en.append("Moisture low. Water immediately.")
-        insights_te.append("తేమ చాలా తక్కువగా ఉంది. వెంటనే నీరు పెట్టండి.")
-        
+        insight_keys.append('low_moisture')
+    insights_en = [INSIGHTS[key]['en'] for key in insight_keys]
+    insights_te = [INSIGHTS[key]['te'] for key in insight_keys]
+
     suggestion_en = f"For {data.Crop_Name}, use {fert_rec['fertilizer']}."
     suggestion_te = f"{data.Crop_Name} పంటకు, {fert_rec['fertilizer']} వాడండి."
 
-    return {
+    result = {
         "Recommended_Fertilizer_Type": fert_rec['fertilizer'],
         "Fertilizer_Purpose": fert_rec['purpose'], # Dict {en, te}
         "Additional_Fertilizer_Info": fert_rec['additional'], # Dict {en, te}
@@ -377,126 +300,425 @@ def predict_fertilizer(data: FertilizerInput):
         "Suggestion": {'en': suggestion_en, 'te': suggestion_te},
         "landArea": data.landArea
     }
+    return result
+
+def store_prediction(data: FertilizerInput, result):
+    """Queue the result for the history store, add its record_id and link it to the chat session."""
+    result["record_id"] = history.record(
+        'predict', data.dict(), result,
+        farmer=data.farmer_name, location=data.location, crop=data.Crop_Name, model_version=MODEL_VERSION,
+    )
+    if data.session_id:
+        sessions.get(data.session_id).prediction = summarize_prediction(result["record_id"], data.Crop_Name, result)
+
+def build_sweep_axes(sweep: SweepInput):
+    """Validate the requested sweep and return an ordered {field: [values]} mapping."""
+    axes = {}
+    for field, rng in sweep.ranges.items():
+        if field not in NUMERIC_FEATURES:
+            raise HTTPException(status_code=400, detail=f"Range sweeps are only supported for numeric fields {NUMERIC_FEATURES}, got '{field}'.")
+        if rng.steps < 1 or rng.steps > MAX_SWEEP_STEPS:
+            raise HTTPException(status_code=400, detail=f"steps for '{field}' must be between 1 and {MAX_SWEEP_STEPS}.")
+        axes[field] = [round(float(v), 6) for v in np.linspace(rng.start, rng.stop, rng.steps)]
+
+    for field, values in sweep.values.items():
+        if field not in FEATURE_COLUMNS:
+            raise HTTPException(status_code=400, detail=f"Unknown sweep field '{field}'. Allowed: {FEATURE_COLUMNS}")
+        if field in axes:
+            raise HTTPException(status_code=400, detail=f"'{field}' is given both as a range and as a value list.")
+        if not values or len(values) > MAX_SWEEP_STEPS:
+            raise HTTPException(status_code=400, detail=f"Value list for '{field}' must have between 1 and {MAX_SWEEP_STEPS} entries.")
+        try:
+            axes[field] = [float(v) for v in values] if field in NUMERIC_FEATURES else [str(v) for v in values]
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail=f"Values for '{field}' must be numeric.")
+
+    if not axes:
+        raise HTTPException(status_code=400, detail="Provide at least one field in 'ranges' or 'values'.")
+
+    # Exact integer product: np.prod works in int64 and silently wraps on huge grids
+    n_points = math.prod(len(v) for v in axes.values())
+    if n_points > MAX_SWEEP_POINTS:
+        raise HTTPException(status_code=400, detail=f"Sweep grid has {n_points} points; the limit is {MAX_SWEEP_POINTS}.")
+    return axes
+
+@app.post("/predict/sweep")
+def predict_sweep(sweep: SweepInput, request: Request):
+    """What-if sweep: evaluate the model over a grid of input variations in one pass.
+
+    Results are columnar: each output key holds a list aligned with the grid columns,
+    ordered like itertools.product over 'axes' (last axis varies fastest).
+    """
+    axes = build_sweep_axes(sweep)
+    fields = list(axes.keys())
+
+    # Build the Cartesian grid once, then overlay it on the repeated base input
+    grid = list(itertools.product(*axes.values()))
+    base = sweep.base.dict(include=set(FEATURE_COLUMNS))
+    grid_df = pd.DataFrame({col: [base[col]] * len(grid) for col in FEATURE_COLUMNS})
+    for i, field in enumerate(fields):
+        grid_df[field] = [point[i] for point in grid]
+
+    ml_types, quantities, probabilities = run_model(grid_df)
+
+    # Crop-specific overrides only depend on (crop, ML type), so resolve each pair once
+    resolved = {}
+    fert_types = []
+    for crop, ml_type in zip(grid_df['Crop_Name'], ml_types):
+        key = (crop, ml_type)
+        if key not in resolved:
+            resolved[key] = get_crop_specific_fertilizer(crop, base['Soil_N'], base['Soil_P'], base['Soil_K'], base['Soil_pH'], ml_type)['fertilizer']
+        fert_types.append(resolved[key])
+
+    return fast_json_response({
+        "points": len(grid),
+        "axes": axes,
+        "grid": {field: grid_df[field].tolist() for field in fields},
+        "Recommended_Fertilizer_Type": fert_types,
+        "Fertilizer_Quantity_kg_per_acre": np.round(quantities, 2).tolist(),
+        "Crop_Success_Probability": np.round(probabilities, 2).tolist(),
+    }, request)
+
+def answer_chat(input_data: ChatInput):
+    """Build the chatbot reply, using and updating session context when a session_id is given."""
+    session = None
+    if input_data.session_id:
+        session = sessions.get(input_data.session_id)
+        if input_data.prediction_id and (session.prediction or {}).get('record_id') != input_data.prediction_id:
+            record = history.get(input_data.prediction_id)
+            if record and record['kind'] == 'predict':
+                session.prediction = summarize_prediction(record['id'], record['inputs']['Crop_Name'], record['outputs'])
+    response = chatbot.get_response(input_data.query, input_data.language, input_data.name, input_data.location, session)
+    history.record(
+        'chat', input_data.dict(), {"reply": response},
+        farmer=input_data.name, location=input_data.location, model_version=MODEL_VERSION,
+    )
+    return response
 
 @app.post("/chat")
-def chat_endpoint(input_data: ChatInput):
-    response = chatbot.get_response(input_data.query, input_data.language, input_data.name, input_data.location)
-    return {"reply": response}
-
-@app.post("/download_report")
-def download_report(data: dict = Body(...)):
-    """Generate and download a PDF report"""
+def chat_endpoint(input_data: ChatInput, request: Request):
+    return fast_json_response({"reply": answer_chat(input_data)}, request)
+
+# Sentence boundaries for English and Telugu replies (Telugu also uses '.', plus the danda)
+SENTENCE_END = re.compile(r'(?<=[.!?।])\s+')
+
+def split_sentences(text):
+    sentences = []
+    for part in SENTENCE_END.split(text):
+        # Keep trailing emoji/punctuation with the sentence before it
+        if sentences and not any(ch.isalnum() for ch in part):
+            sentences[-1] += " " + part
+        elif part.strip():
+            sentences.append(part)
+    return sentences
+
+@app.post("/chat/stream")
+def chat_stream(input_data: ChatInput):
+    """Server-sent events: one 'sentence' event per sentence, then 'done' with the full reply.
+
+    Lets the voice assistant start speaking the first sentence straight away.
+    """
+    reply = answer_chat(input_data)
+
+    def events():
+        for sentence in split_sentences(reply):
+            yield format_sse('sentence', {"text": sentence})
+        yield format_sse('done', {"reply": reply})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.get("/monitor/drift")
+def drift_report(request: Request):
+    """Live vs. training distributions (PSI / KS per feature and output) and unknown-category counts."""
+    return fast_json_response(drift_monitor.report(), request)
+
+@app.get("/monitor/drift/state")
+def drift_state(request: Request):
+    """Raw sketch counts of this worker, for merging with other workers via /monitor/drift/merge."""
+    return fast_json_response(drift_monitor.state(), request)
+
+@app.post("/monitor/drift/merge")
+def drift_merge(states: List[dict], request: Request):
+    """Combined drift report for the given /monitor/drift/state snapshots (e.g. one per worker)."""
+    merged = drift_monitor.empty_copy()
     try:
-        pdf = FPDF()
-        pdf.add_page()
-        
-        # Helper to safely encode text for PDF (Latin-1)
-        def safe_text(text):
-            if not text: return ""
-            # Replace common incompatible chars
-            text = str(text).replace("–", "-").replace("—", "-").replace("’", "'")
+        for state in states:
+            merged.merge(state)
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid drift state: {e}")
+    return fast_json_response(merged.report(), request)
+
+@app.get("/chat/sessions/stats")
+def chat_session_stats():
+    return sessions.stats()
+
+def parse_date(value, field):
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{field} must be an ISO date, e.g. 2025-06-01.")
+
+def require_history_token(request: Request):
+    """Reject the request unless it carries HISTORY_API_TOKEN (no-op when the token is not configured)."""
+    if HISTORY_API_TOKEN is None:
+        return
+    supplied = request.headers.get('authorization', '')
+    if not hmac.compare_digest(supplied.encode('utf-8'), f"Bearer {HISTORY_API_TOKEN}".encode('utf-8')):
+        raise HTTPException(status_code=401, detail="A valid history API token is required.",
+                            headers={"WWW-Authenticate": "Bearer"})
+
+@app.get("/history")
+def get_history(request: Request, farmer: str = None, location: str = None, crop: str = None, kind: str = None,
+                since: str = None, until: str = None, limit: int = 50):
+    """Stored predictions and chat turns, newest first. Dates are ISO format (since inclusive, until exclusive).
+
+    A farmer or location filter is required so one call cannot list everyone's records.
+    """
+    require_history_token(request)
+    if not (farmer or '').strip() and not (location or '').strip():
+        raise HTTPException(status_code=400, detail="Provide a farmer or location filter.")
+    if kind is not None and kind not in ('predict', 'chat'):
+        raise HTTPException(status_code=400, detail="kind must be 'predict' or 'chat'.")
+    records = history.query(
+        farmer=farmer, location=location, crop=crop, kind=kind,
+        since=parse_date(since, 'since'), until=parse_date(until, 'until'), limit=max(1, min(limit, 500)),
+    )
+    return fast_json_response({"count": len(records), "records": records}, request)
+
+@app.get("/history/{record_id}")
+def get_history_record(record_id: str, request: Request):
+    require_history_token(request)
+    record = history.get(record_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Record not found.")
+    return fast_json_response(record, request)
+
+@app.get("/report/{record_id}")
+def download_stored_report(record_id: str, request: Request):
+    """Regenerate the PDF report for a stored /predict result."""
+    require_history_token(request)
+    record = history.get(record_id)
+    if not record or record['kind'] != 'predict':
+        raise HTTPException(status_code=404, detail="Prediction record not found.")
+    return download_report(report_data_from_record(record))
+
+def report_data_from_record(record):
+    """The /download_report payload for a stored prediction record."""
+    inputs = record['inputs']
+    report_data = dict(record['outputs'])
+    report_data['farmer_name'] = inputs.get('farmer_name') or 'N/A'
+    report_data['location'] = inputs.get('location') or 'N/A'
+    return report_data
+
+# Background Jobs
+def run_batch_predict(job, items):
+    """Predict `items` in chunks, emitting each chunk's results as soon as it is ready."""
+    for offset in range(0, len(items), BATCH_CHUNK_SIZE):
+        chunk = items[offset:offset + BATCH_CHUNK_SIZE]
+        chunk_df = pd.DataFrame([item.dict(include=set(FEATURE_COLUMNS)) for item in chunk])
+        ml_types, quantities, probabilities = run_model(chunk_df)
+
+        results = []
+        for (_, features), item, ml_type, quantity, prob in zip(chunk_df.iterrows(), chunk, ml_types, quantities, probabilities):
+            drift_monitor.observe(features, ml_type, quantity, prob)
+            result = build_prediction(item, ml_type, float(quantity), float(prob))
+            store_prediction(item, result)
+            results.append(shape_prediction(result, item.language, item.response_mode))
+        # Full results go to live listeners; finished jobs only keep the history record IDs
+        job.emit('partial', {"offset": offset, "results": results},
+                 retained={"offset": offset, "record_ids": [result["record_id"] for result in results]})
+        job.progress(offset + len(chunk))
+
+def run_report_job(job, record_ids):
+    """Render one PDF per stored prediction; each becomes downloadable as soon as it is done."""
+    for index, record_id in enumerate(record_ids):
+        record = history.get(record_id)
+        if not record or record['kind'] != 'predict':
+            job.emit('item_error', {"index": index, "record_id": record_id, "detail": "Prediction record not found."})
+        else:
             try:
-                # Try to use existing latin-1 chars
-                return text.encode('latin-1', 'replace').decode('latin-1')
-            except:
-                return "???"
+                job.save_file(index, build_report_pdf(report_data_from_record(record)), suffix='.pdf')
+                job.emit('partial', {"index": index, "record_id": record_id, "url": f"/jobs/{job.id}/files/{index}"})
+            except Exception as e:
+                print(f"PDF Error: {e}")
+                job.emit('item_error', {"index": index, "record_id": record_id, "detail": "Error generating PDF."})
+        job.progress(index + 1)
+
+def job_accepted(job):
+    if job is None:
+        raise HTTPException(status_code=429, detail="Too many jobs in progress. Try again later.")
+    return fast_json_response({
+        **job.snapshot(),
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events",
+    }, status_code=202)
+
+@app.post("/jobs/predict")
+def start_batch_predict(batch: BatchPredictInput):
+    if not batch.items:
+        raise HTTPException(status_code=400, detail="items is empty.")
+    if len(batch.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_ITEMS} items per batch.")
+    if any(item.response_mode not in RESPONSE_MODES for item in batch.items):
+        raise HTTPException(status_code=400, detail=f"response_mode must be one of {RESPONSE_MODES}.")
+    return job_accepted(jobs.submit('predict', len(batch.items), run_batch_predict, batch.items))
+
+@app.post("/jobs/reports")
+def start_report_job(data: ReportJobInput, request: Request):
+    require_history_token(request)
+    if not data.record_ids:
+        raise HTTPException(status_code=400, detail="record_ids is empty.")
+    if len(data.record_ids) > MAX_REPORT_JOB_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_REPORT_JOB_ITEMS} reports per job.")
+    return job_accepted(jobs.submit('reports', len(data.record_ids), run_report_job, data.record_ids))
+
+def get_job_or_404(job_id):
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    return get_job_or_404(job_id).snapshot()
+
+@app.get("/jobs/{job_id}/events")
+def stream_job_events(job_id: str, request: Request):
+    """SSE stream of 'status', 'progress', 'partial', 'item_error' and a final 'done' or 'error' event.
+
+    Reconnecting clients send Last-Event-ID to resume after the last event they saw.
+    """
+    job = get_job_or_404(job_id)
+    start = 0
+    last_event_id = request.headers.get('last-event-id')
+    if last_event_id and last_event_id.isdigit():
+        start = int(last_event_id) + 1
+    return StreamingResponse(jobs.stream(job, start), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.get("/jobs/{job_id}/files/{index}")
+def download_job_file(job_id: str, index: int):
+    job = get_job_or_404(job_id)
+    path = job.files.get(index)
+    if path is None or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="File not ready or not found.")
+    return FileResponse(path, media_type="application/pdf", filename=f"report_{index + 1}.pdf")
+
+def build_report_pdf(data):
+    """Render the recommendation PDF and return it as bytes"""
+    pdf = FPDF()
+    pdf.add_page()
+    
+    # Helper to safely encode text for PDF (Latin-1)
+    def safe_text(text):
+        if not text: return ""
+        # Replace common incompatible chars
+        text = str(text).replace("–", "-").replace("—", "-").replace("’", "'")
+        try:
+            # Try to use existing latin-1 chars
+            return text.encode('latin-1', 'replace').decode('latin-1')
+        except:
+            return "???"
 
-        # NOTE: PDF is generated in English primarily to avoid font issues with FPDF standard
-        # If we had a unicode font we could use it, but for stability we stick to safe text.
-        
-        # Color variables
-        pdf.set_text_color(40, 40, 40)
-        
-        # Title
-        pdf.set_font("Arial", 'B', 24)
-        pdf.set_text_color(47, 133, 90) # Green
-        pdf.cell(0, 15, "Smart Fertilizer Recommendation", 0, 1, 'C')
-        
-        pdf.set_font("Arial", 'I', 12)
-        pdf.set_text_color(100, 100, 100)
-        pdf.cell(0, 10, "Providing accurate farming intelligence", 0, 1, 'C')
-        pdf.ln(10)
-        
-        # Farmer Details
-        pdf.set_font("Arial", 'B', 14)
-        pdf.set_text_color(0, 0, 0)
-        pdf.cell(0, 10, "Farmer Details", 0, 1)
-        
-        pdf.set_font("Arial", '', 12)
-        pdf.set_fill_color(240, 255, 240)
-        pdf.cell(100, 10, safe_text(f"Name: {data.get('farmer_name', 'N/A')}"), 1, 0, 'L', 1)
-        pdf.cell(90, 10, safe_text(f"Location: {data.get('location', 'N/A')}"), 1, 1, 'L', 1)
-        pdf.ln(5)
-        
-        # Recommendation
-        pdf.set_font("Arial", 'B', 16)
-        pdf.set_text_color(47, 133, 90)
-        pdf.cell(0, 10, "Recommendation", 0, 1)
-        
-        fert_type = data.get('Recommended_Fertilizer_Type', 'N/A')
-        qty = data.get('Fertilizer_Quantity_kg_per_acre', 0)
-        area = data.get('landArea', 1)
-        total_qty = round(qty * area, 2)
-        
-        pdf.set_font("Arial", '', 12)
-        pdf.set_text_color(0, 0, 0)
-        
-        pdf.cell(95, 10, "Recommended Fertilizer", 1, 0)
-        pdf.cell(95, 10, safe_text(str(fert_type)), 1, 1)
-        
-        pdf.cell(95, 10, "Quantity per Acre", 1, 0)
-        pdf.cell(95, 10, f"{qty} kg", 1, 1)
-        
-        pdf.cell(95, 10, "Land Area", 1, 0)
-        pdf.cell(95, 10, f"{area} acres", 1, 1)
-        
+    # NOTE: PDF is generated in English primarily to avoid font issues with FPDF standard
+    # If we had a unicode font we could use it, but for stability we stick to safe text.
+    
+    # Color variables
+    pdf.set_text_color(40, 40, 40)
+    
+    # Title
+    pdf.set_font("Arial", 'B', 24)
+    pdf.set_text_color(47, 133, 90) # Green
+    pdf.cell(0, 15, "Smart Fertilizer Recommendation", 0, 1, 'C')
+    
+    pdf.set_font("Arial", 'I', 12)
+    pdf.set_text_color(100, 100, 100)
+    pdf.cell(0, 10, "Providing accurate farming intelligence", 0, 1, 'C')
+    pdf.ln(10)
+    
+    # Farmer Details
+    pdf.set_font("Arial", 'B', 14)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(0, 10, "Farmer Details", 0, 1)
+    
+    pdf.set_font("Arial", '', 12)
+    pdf.set_fill_color(240, 255, 240)
+    pdf.cell(100, 10, safe_text(f"Name: {data.get('farmer_name', 'N/A')}"), 1, 0, 'L', 1)
+    pdf.cell(90, 10, safe_text(f"Location: {data.get('location', 'N/A')}"), 1, 1, 'L', 1)
+    pdf.ln(5)
+    
+    # Recommendation
+    pdf.set_font("Arial", 'B', 16)
+    pdf.set_text_color(47, 133, 90)
+    pdf.cell(0, 10, "Recommendation", 0, 1)
+    
+    fert_type = data.get('Recommended_Fertilizer_Type', 'N/A')
+    qty = data.get('Fertilizer_Quantity_kg_per_acre', 0)
+    area = data.get('landArea', 1)
+    total_qty = round(qty * area, 2)
+    
+    pdf.set_font("Arial", '', 12)
+    pdf.set_text_color(0, 0, 0)
+    
+    pdf.cell(95, 10, "Recommended Fertilizer", 1, 0)
+    pdf.cell(95, 10, safe_text(str(fert_type)), 1, 1)
+    
+    pdf.cell(95, 10, "Quantity per Acre", 1, 0)
+    pdf.cell(95, 10, f"{qty} kg", 1, 1)
+    
+    pdf.cell(95, 10, "Land Area", 1, 0)
+    pdf.cell(95, 10, f"{area} acres", 1, 1)
+    
+    pdf.set_font("Arial", 'B', 12)
+    pdf.cell(95, 10, "Total Quantity Required", 1, 0)
+    pdf.cell(95, 10, f"{total_qty} kg", 1, 1)
+    pdf.ln(5)
+    
+    # Handle Bilingual Dicts -> Fallback to English for PDF
+    def get_en(val):
+        if isinstance(val, dict): return val.get('en', '')
+        return val
+
+    purpose = get_en(data.get('Fertilizer_Purpose', ''))
+    if purpose:
         pdf.set_font("Arial", 'B', 12)
-        pdf.cell(95, 10, "Total Quantity Required", 1, 0)
-        pdf.cell(95, 10, f"{total_qty} kg", 1, 1)
-        pdf.ln(5)
-        
-        # Handle Bilingual Dicts -> Fallback to English for PDF
-        def get_en(val):
-            if isinstance(val, dict): return val.get('en', '')
-            return val
-
-        purpose = get_en(data.get('Fertilizer_Purpose', ''))
-        if purpose:
-            pdf.set_font("Arial", 'B', 12)
-            pdf.cell(0, 8, "Purpose:", 0, 1)
-            pdf.set_font("Arial", '', 11)
-            pdf.multi_cell(0, 6, safe_text(purpose))
-            pdf.ln(5)
-
-        # Irrigation
-        pdf.set_font("Arial", 'B', 14)
-        pdf.set_text_color(37, 99, 235) # Blue
-        pdf.cell(0, 10, "Irrigation Guidance", 0, 1)
-        
-        pdf.set_text_color(0, 0, 0)
+        pdf.cell(0, 8, "Purpose:", 0, 1)
         pdf.set_font("Arial", '', 11)
-        
-        method = get_en(data.get('Irrigation_Method', ''))
-        timing = get_en(data.get('Irrigation_Timing', ''))
-        tips = get_en(data.get('Irrigation_Tips', ''))
-        
-        if method: pdf.multi_cell(0, 8, safe_text(f"Method: {method}"))
-        if timing: pdf.multi_cell(0, 8, safe_text(f"Timing: {timing}"))
-        if tips: pdf.multi_cell(0, 8, safe_text(f"Tips: {tips}"))
-            
+        pdf.multi_cell(0, 6, safe_text(purpose))
         pdf.ln(5)
 
-        # Footer
-        pdf.set_y(-30)
-        pdf.set_font("Arial", 'I', 8)
-        pdf.cell(0, 10, "Generated by Smart Fertilizer Recommendation System", 0, 0, 'C')
-
-        # Output
-        pdf_output = io.BytesIO()
-        pdf_string = pdf.output(dest='S').encode('latin-1') 
-        pdf_output.write(pdf_string)
-        pdf_output.seek(0)
+    # Irrigation
+    pdf.set_font("Arial", 'B', 14)
+    pdf.set_text_color(37, 99, 235) # Blue
+    pdf.cell(0, 10, "Irrigation Guidance", 0, 1)
+    
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_font("Arial", '', 11)
+    
+    method = get_en(data.get('Irrigation_Method', ''))
+    timing = get_en(data.get('Irrigation_Timing', ''))
+    tips = get_en(data.get('Irrigation_Tips', ''))
+    
+    if method: pdf.multi_cell(0, 8, safe_text(f"Method: {method}"))
+    if timing: pdf.multi_cell(0, 8, safe_text(f"Timing: {timing}"))
+    if tips: pdf.multi_cell(0, 8, safe_text(f"Tips: {tips}"))
         
+    pdf.ln(5)
+
+    # Footer
+    pdf.set_y(-30)
+    pdf.set_font("Arial", 'I', 8)
+    pdf.cell(0, 10, "Generated by Smart Fertilizer Recommendation System", 0, 0, 'C')
+
+    # Output
+    return pdf.output(dest='S').encode('latin-1')
+
+@app.post("/download_report")
+def download_report(data: dict = Body(...)):
+    """Generate and download a PDF report"""
+    try:
+        pdf_output = io.BytesIO(build_report_pdf(data))
         return StreamingResponse(
             pdf_output, 
             media_type="application/pdf", 
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+
+MAX_SESSION_ID_LENGTH = 64
+
+
+class SessionState:
+    """Compact per-session chat context. __slots__ keeps each state to a few hundred bytes."""
+    __slots__ = ('last_topic', 'crop', 'language', 'prediction', 'last_seen')
+
+    def __init__(self):
+        self.last_topic = None
+        self.crop = None
+        self.language = 'en'
+        self.prediction = None  # Summary of the latest /predict result: {record_id, crop, fertilizer, quantity}
+        self.last_seen = time.monotonic()
+
+
+class SessionStore:
+    """Bounded in-memory LRU of chat sessions with idle expiry.
+
+    Sessions are kept in last-access order, so both LRU eviction and TTL expiry only
+    ever pop from the front of the OrderedDict. Memory is capped by `max_sessions`.
+    """
+
+    def __init__(self, max_sessions=20000, ttl_seconds=1800):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted_lru = 0
+        self.evicted_ttl = 0
+
+    def _expire(self, now):
+        while self._sessions:
+            session_id, state = next(iter(self._sessions.items()))
+            if now - state.last_seen < self.ttl_seconds:
+                break
+            self._sessions.popitem(last=False)
+            self.evicted_ttl += 1
+
+    def get(self, session_id):
+        """Return the state for `session_id`, creating it if missing or expired."""
+        session_id = str(session_id)
+        if len(session_id) > MAX_SESSION_ID_LENGTH:
+            # Truncating would let two clients with a shared prefix share one session
+            raise ValueError(f"session_id must be at most {MAX_SESSION_ID_LENGTH} characters")
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            state = self._sessions.get(session_id)
+            if state is None:
+                self.misses += 1
+                state = SessionState()
+                self._sessions[session_id] = state
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+                    self.evicted_lru += 1
+            else:
+                self.hits += 1
+                self._sessions.move_to_end(session_id)
+            state.last_seen = now
+            return state
+
+    def stats(self):
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                "active_sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evicted_lru": self.evicted_lru,
+                "evicted_ttl": self.evicted_ttl,
+            }
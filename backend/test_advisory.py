@@ -0,0 +1,78 @@
+from advisory import (
+    CROP_FERTILIZERS_EN, INSIGHTS, IRRIGATION_GUIDES, STRING_IDS, STRING_TABLE, STRINGS_VERSION,
+    build_string_table, get_crop_specific_fertilizer, get_irrigation_guidance, shape_prediction, strings_etag,
+)
+
+
+def make_result(crop='Rice', moisture=30):
+    fert = get_crop_specific_fertilizer(crop, 40, 20, 60, 5.5, 'Urea')
+    irr = get_irrigation_guidance(crop, 'Kharif', moisture)
+    return {
+        "Recommended_Fertilizer_Type": fert['fertilizer'],
+        "Fertilizer_Purpose": fert['purpose'],
+        "Additional_Fertilizer_Info": fert['additional'],
+        "Fertilizer_Quantity_kg_per_acre": 42.5,
+        "Irrigation_Method": irr['method'],
+        "Irrigation_Tips": irr['tips'],
+        "Insights": {'en': [INSIGHTS['acidic']['en']], 'te': [INSIGHTS['acidic']['te']]},
+        "Suggestion": {'en': f"For {crop}, use Urea.", 'te': f"{crop} పంటకు, Urea వాడండి."},
+        "record_id": "abc",
+    }
+
+
+def test_string_table_covers_every_static_text():
+    table = build_string_table()
+    assert table == STRING_TABLE
+    for crop in CROP_FERTILIZERS_EN:
+        assert table[f'fert.{crop}.purpose']['en'] == CROP_FERTILIZERS_EN[crop]['purpose']
+    for crop, (guide_en, _) in IRRIGATION_GUIDES.items():
+        assert table[f'irr.{crop}.method']['en'] == guide_en['method']
+    assert table['insight.acidic'] == INSIGHTS['acidic']
+    assert all(set(text) == {'en', 'te'} for text in table.values())
+    # The reverse lookup must not collapse two IDs onto one text pair
+    assert len(STRING_IDS) == len(table)
+
+
+def test_full_mode_is_unchanged():
+    result = make_result()
+    assert shape_prediction(result, 'te', 'full') is result
+
+
+def test_language_mode_keeps_one_language():
+    shaped = shape_prediction(make_result(), 'te', 'language')
+    assert shaped['Fertilizer_Purpose'] == STRING_TABLE['fert.rice.purpose']['te']
+    assert shaped['Insights'] == [INSIGHTS['acidic']['te']]
+    assert shaped['Suggestion'] == "Rice పంటకు, Urea వాడండి."
+    assert shaped['Fertilizer_Quantity_kg_per_acre'] == 42.5
+    assert shaped['language'] == 'te'
+    assert 'strings_version' not in shaped
+    # Unsupported languages fall back to English
+    assert shape_prediction(make_result(), 'fr', 'language')['language'] == 'en'
+
+
+def test_compact_mode_references_resolve_against_string_table():
+    result = make_result(moisture=10)
+    shaped = shape_prediction(result, 'en', 'compact')
+    assert shaped['strings_version'] == STRINGS_VERSION
+    assert shaped['Fertilizer_Purpose'] == '@fert.rice.purpose'
+    assert shaped['Irrigation_Method'] == '@irr.rice.method'
+    assert shaped['Insights'] == ['@insight.acidic']
+    for key, value in result.items():
+        if isinstance(value, dict) and isinstance(value.get('en'), str) and shaped[key].startswith('@'):
+            assert STRING_TABLE[shaped[key][1:]] == value
+    # Input-dependent texts stay inline (the low-moisture warning changes the tips)
+    assert shaped['Irrigation_Tips'] == result['Irrigation_Tips']['en']
+    assert shaped['Suggestion'] == "For Rice, use Urea."
+
+
+def test_unknown_crop_falls_back_to_default_strings():
+    shaped = shape_prediction(make_result(crop='Banana'), 'en', 'compact')
+    assert shaped['Additional_Fertilizer_Info'] == '@fert.default.additional'
+    assert shaped['Irrigation_Method'] == '@irr.default.method'
+    assert shaped['Fertilizer_Purpose'] == 'Recommended for Banana'
+
+
+def test_strings_etag_differs_per_representation():
+    tags = {strings_etag(language, encoding) for language in (None, 'en', 'te') for encoding in (None, 'gzip', 'br')}
+    assert len(tags) == 9
+    assert strings_etag() == f'"{STRINGS_VERSION}-all-identity"'
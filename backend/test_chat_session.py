@@ -0,0 +1,20 @@
+import requests
+import json
+
+url = "http://localhost:8000/chat"
+session_id = "test-session-1"
+questions = [
+    "What is the best fertilizer for rice?",
+    "and for wheat?",
+    "how often should I water?",
+    "who are you",  # Unrelated, should get the general reply
+]
+
+try:
+    for query in questions:
+        response = requests.post(url, json={"query": query, "session_id": session_id})
+        print(response.status_code, query)
+        print(response.json())
+    print(requests.get("http://localhost:8000/chat/sessions/stats").json())
+except Exception as e:
+    print(f"Error: {e}")
@@ -0,0 +1,41 @@
+import gzip
+
+import compression
+from compression import compress, etag_matches, negotiate_encoding
+
+
+def test_negotiation_honours_q_values(monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', object())  # Only checked for availability here
+    assert negotiate_encoding('gzip, deflate, br') == 'br'
+    assert negotiate_encoding('br;q=0, gzip') == 'gzip'
+    assert negotiate_encoding('br;q=0.5, gzip;q=0.8') == 'gzip'
+    assert negotiate_encoding('BR ; Q=1') == 'br'
+    assert negotiate_encoding('*') == 'br'
+    assert negotiate_encoding('*;q=0, gzip') == 'gzip'
+    assert negotiate_encoding('gzip;q=0, br;q=0') is None
+    assert negotiate_encoding('gzip;q=abc') is None
+    assert negotiate_encoding('identity') is None
+    assert negotiate_encoding(None) is None
+
+
+def test_brotli_is_not_offered_when_missing(monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', None)
+    assert negotiate_encoding('br') is None
+    assert negotiate_encoding('br, gzip') == 'gzip'
+
+
+def test_compress_round_trip():
+    body = b'{"a": 1}' * 100
+    assert gzip.decompress(compress(body, 'gzip')) == body
+    assert compress(body, None) is body
+
+
+def test_etag_matching():
+    etag = '"v1-all-gzip"'
+    assert etag_matches('"v1-all-gzip"', etag)
+    assert etag_matches('"other", "v1-all-gzip"', etag)
+    assert etag_matches('W/"v1-all-gzip"', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches('"v1-all-br"', etag)
+    assert not etag_matches('', etag)
+    assert not etag_matches(None, etag)
@@ -0,0 +1,98 @@
+import math
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from drift_monitor import CategorySketch, DriftMonitor, NumericSketch, ks_statistic, psi
+
+
+def test_numeric_merge_matches_single_sketch():
+    rng = random.Random(0)
+    values = [rng.gauss(6.5, 1.2) for _ in range(500)]
+    cuts = [5.0, 6.0, 7.0, 8.0]
+    whole, left, right = NumericSketch(cuts), NumericSketch(cuts), NumericSketch(cuts)
+    for v in values:
+        whole.add(v)
+    for v in values[:123]:
+        left.add(v)
+    for v in values[123:]:
+        right.add(v)
+
+    left.merge(right.state())
+    assert left.bins == whole.bins
+    assert left.count == whole.count
+    assert math.isclose(left.mean, whole.mean, rel_tol=1e-12)
+    assert math.isclose(left.m2, whole.m2, rel_tol=1e-9)
+    assert (left.min, left.max) == (whole.min, whole.max)
+
+
+def test_numeric_merge_into_empty_sketch():
+    empty, full = NumericSketch([1.0]), NumericSketch([1.0])
+    for v in (0.5, 1.5, 2.5):
+        full.add(v)
+    empty.merge(full.state())
+    assert empty.state() == full.state()
+
+
+def test_psi_known_values():
+    assert psi([0.5, 0.5], [0.5, 0.5]) == 0.0
+    expected = (0.8 - 0.5) * math.log(0.8 / 0.5) + (0.2 - 0.5) * math.log(0.2 / 0.5)
+    assert math.isclose(psi([0.5, 0.5], [0.8, 0.2]), expected)
+    # Empty bins are smoothed rather than dividing by zero
+    assert math.isfinite(psi([1.0, 0.0], [0.0, 1.0]))
+
+
+def test_ks_statistic_known_values():
+    assert ks_statistic([0.25] * 4, [0.25] * 4) == 0.0
+    assert math.isclose(ks_statistic([0.5, 0.5, 0.0], [0.0, 0.5, 0.5]), 0.5)
+    assert math.isclose(ks_statistic([1.0, 0.0], [0.0, 1.0]), 1.0)
+
+
+def test_category_sketch_caps_distinct_values_without_known_list():
+    sketch = CategorySketch(max_categories=3)
+    for value in ['a', 'b', 'c', 'd', 'e', 'a']:
+        sketch.add(value)
+    assert sketch.counts == {'a': 2, 'b': 1, 'c': 1}
+    assert sketch.unknown == 2
+    assert sketch.unknown_examples == ['d', 'e']
+
+    other = CategorySketch(max_categories=3)
+    for value in ['x', 'y', 'c']:
+        other.add(value)
+    sketch.merge(other.state())
+    assert set(sketch.counts) == {'a', 'b', 'c'}
+    assert sketch.counts['c'] == 2
+    assert sketch.unknown == 4
+
+
+def test_unknown_categories_are_counted_against_the_encoder():
+    monitor = DriftMonitor(['Soil_pH'], ['Crop_Name'], known_categories={'Crop_Name': ['Rice', 'Wheat']})
+    for crop in ['Rice', 'Mango', 'Wheat', 'Mango']:
+        monitor.observe({'Soil_pH': 6.5, 'Crop_Name': crop}, 'Urea', 40.0, 0.8)
+    report = monitor.report()['features']['Crop_Name']
+    assert report['unknown'] == 2
+    assert report['unknown_rate'] == 0.5
+    assert report['unknown_examples'] == ['Mango']
+
+
+def test_non_finite_values_are_counted_not_mixed_in():
+    monitor = DriftMonitor(['Soil_pH'], [])
+    for ph in (6.0, float('nan'), 7.0, float('inf')):
+        monitor.observe({'Soil_pH': ph}, 'Urea', 40.0, 0.8)
+    sketch = monitor.numeric['Soil_pH']
+    assert (sketch.count, sketch.non_finite) == (2, 2)
+    assert sketch.mean == 6.5 and (sketch.min, sketch.max) == (6.0, 7.0)
+    assert monitor.report()['features']['Soil_pH']['non_finite'] == 2
+
+    merged = monitor.empty_copy()
+    merged.merge(monitor.state())
+    merged.merge(monitor.state())
+    assert merged.numeric['Soil_pH'].non_finite == 4
+    assert merged.numeric['Soil_pH'].mean == 6.5
+
+    poisoned = monitor.state()
+    poisoned['numeric']['Soil_pH']['mean'] = float('nan')
+    with pytest.raises(ValueError):
+        monitor.empty_copy().merge(poisoned)
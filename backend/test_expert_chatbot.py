@@ -0,0 +1,55 @@
+from expert_chatbot import AgricultureExpertChatbot
+from session_store import SessionState
+
+bot = AgricultureExpertChatbot()
+GENERAL = bot.generate_general_response("")
+RICE = bot.generate_fertilizer_response("rice")
+ORGANIC = bot.generate_fertilizer_response("organic")
+
+
+def ask(session, *queries, language='en'):
+    return [bot.get_response(query, language, session=session) for query in queries]
+
+
+def test_crop_names_match_whole_words():
+    assert bot.extract_crop("What fertilizer for rice?") == 'rice'
+    assert bot.extract_crop("Tomatoes need water") == 'tomato'
+    assert bot.extract_crop("What is the price of urea?") is None
+    assert bot.extract_crop("వరికి ఏ ఎరువు?") == 'rice'
+    assert bot.generate_fertilizer_response("Fertilizer price?") != RICE
+
+
+def test_unrelated_short_question_is_not_a_follow_up():
+    session = SessionState()
+    replies = ask(session, "What fertilizer for rice?", "who are you")
+    assert replies == [RICE, GENERAL]
+    assert session.last_topic == 'fertilizer'
+
+
+def test_follow_ups_keep_topic_and_crop():
+    session = SessionState()
+    first, follow_up, crop_only = ask(session, "How much water does rice need?", "how often?", "and wheat?")
+    assert follow_up == bot.generate_irrigation_response("how often")
+    assert crop_only == bot.generate_irrigation_response("wheat")
+    assert session.crop == 'wheat'
+
+    session = SessionState()
+    assert ask(session, "What fertilizer for rice?", "what about later?") == [RICE, RICE]
+    assert bot.is_follow_up("wheat?")
+    assert not bot.is_follow_up("tell me a joke")
+
+
+def test_remembered_crop_does_not_override_the_question():
+    session = SessionState()
+    replies = ask(session, "What fertilizer for rice?", "What organic fertilizer should I use?")
+    assert replies == [RICE, ORGANIC]
+    # Same answer as without a session
+    assert replies[1] == bot.get_response("What organic fertilizer should I use?")
+    assert session.crop == 'rice'
+
+
+def test_remembered_crop_answers_crop_free_questions():
+    session = SessionState()
+    ask(session, "Best fertilizer for rice?")
+    assert ask(session, "What fertilizer should I use now?") == [RICE]
+    assert bot.get_response("What fertilizer should I use now?") != RICE
@@ -0,0 +1,74 @@
+import time
+
+from history_store import HistoryStore
+
+
+def make_store(tmp_path, **kwargs):
+    return HistoryStore(str(tmp_path / "history.db"), **kwargs)
+
+
+def test_pending_record_is_readable_before_commit(tmp_path):
+    # A long flush interval keeps the row queued while we read it
+    store = make_store(tmp_path, flush_interval=1.0)
+    try:
+        record_id = store.record('predict', {"Crop_Name": "Rice"}, {"Recommended_Fertilizer_Type": "Urea"},
+                                 farmer="Ravi", location="Guntur", crop="Rice", model_version="abc")
+        pending = store.get(record_id)
+        assert pending is not None
+        assert pending['outputs'] == {"Recommended_Fertilizer_Type": "Urea"}
+        # query() only sees committed rows
+        assert store.query(farmer="ravi") == []
+
+        store.flush()
+        committed = store.get(record_id)
+        assert committed == pending
+        assert store._pending == {}
+        assert [r['id'] for r in store.query(farmer="ravi")] == [record_id]
+    finally:
+        store.close()
+
+
+def test_query_filters(tmp_path):
+    store = make_store(tmp_path, flush_interval=0.05)
+    try:
+        rice = store.record('predict', {}, {}, farmer="Ravi", location="Guntur", crop="Rice")
+        wheat = store.record('predict', {}, {}, farmer="Ravi", location="Nellore", crop="Wheat")
+        chat = store.record('chat', {}, {}, farmer="Sita", location="Guntur")
+        store.flush()
+
+        assert {r['id'] for r in store.query(farmer=" RAVI ")} == {rice, wheat}
+        assert {r['id'] for r in store.query(location="guntur")} == {rice, chat}
+        assert [r['id'] for r in store.query(crop="wheat")] == [wheat]
+        assert [r['id'] for r in store.query(kind="chat")] == [chat]
+        assert [r['id'] for r in store.query(farmer="ravi", location="guntur")] == [rice]
+        assert store.query(since=time.time() + 60) == []
+        assert len(store.query(until=time.time() + 60)) == 3
+        assert len(store.query(limit=2)) == 2
+    finally:
+        store.close()
+
+
+def test_writer_survives_unexpected_errors(tmp_path, monkeypatch):
+    store = make_store(tmp_path, flush_interval=0.05)
+    try:
+        write_batch = store._write_batch
+        calls = []
+
+        def failing_once(conn, rows):
+            calls.append(len(rows))
+            if len(calls) == 1:
+                raise RuntimeError("unexpected")
+            write_batch(conn, rows)
+
+        monkeypatch.setattr(store, '_write_batch', failing_once)
+        lost = store.record('predict', {}, {}, farmer="Ravi")
+        store.flush()  # Must not hang even though the batch failed
+        assert store.get(lost) is None
+        assert store.dropped == 1
+
+        kept = store.record('predict', {}, {}, farmer="Ravi")
+        store.flush()
+        assert store._writer.is_alive()
+        assert [r['id'] for r in store.query(farmer="ravi")] == [kept]
+    finally:
+        store.close()
@@ -0,0 +1,133 @@
+import asyncio
+import os
+import threading
+import time
+
+from jobs import JobManager
+
+
+def parse_events(chunks):
+    """[(id, event, data_json)] for the SSE chunks, skipping keep-alives."""
+    events = []
+    for chunk in chunks:
+        if chunk.startswith(':'):
+            continue
+        fields = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+        events.append((int(fields['id']), fields['event'], fields['data']))
+    return events
+
+
+def collect(stream, limit=None):
+    """Read SSE chunks from the async `stream`, stopping early after `limit` events."""
+    async def read():
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk)
+            if limit is not None and len(parse_events(chunks)) == limit:
+                break
+        await stream.aclose()  # Client disconnects
+        return chunks
+    return asyncio.run(read())
+
+
+def make_manager(tmp_path, **kwargs):
+    return JobManager(max_workers=1, files_dir=str(tmp_path), **kwargs)
+
+
+def run_job(manager, target, *args):
+    job = manager.submit('test', 3, target, *args)
+    collect(manager.stream(job, poll_interval=0.01))  # Wait for it to finish
+    return job
+
+
+def test_stream_resumes_after_last_event_id(tmp_path):
+    release = threading.Event()
+
+    def target(job):
+        for i in range(3):
+            job.emit('partial', {"i": i})
+            job.progress(i + 1)
+            if i == 0:
+                release.wait(timeout=5)
+
+    manager = make_manager(tmp_path)
+    job = manager.submit('test', 3, target)
+    seen = parse_events(collect(manager.stream(job, poll_interval=0.01), limit=3))  # status, partial 0, progress 1
+    release.set()
+
+    assert [event for _, event, _ in seen] == ['status', 'partial', 'progress']
+    last_event_id = seen[-1][0]
+
+    resumed = parse_events(collect(manager.stream(job, start=last_event_id + 1, poll_interval=0.01)))
+    assert resumed[0][0] == last_event_id + 1
+    assert [event for _, event, _ in resumed] == ['partial', 'progress', 'partial', 'progress', 'done']
+    ids = [event_id for event_id, _, _ in seen + resumed]
+    assert ids == list(range(len(ids)))
+
+
+def test_waiting_stream_does_not_block_the_event_loop(tmp_path):
+    release = threading.Event()
+    manager = make_manager(tmp_path)
+    job = manager.submit('test', 1, lambda job: release.wait(timeout=5))
+
+    async def read():
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        stream = manager.stream(job, heartbeat=0.1, poll_interval=0.01)
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk)
+            if chunk.startswith(':'):
+                break
+        await stream.aclose()
+        task.cancel()
+        return chunks, len(ticks)
+
+    chunks, ticks = asyncio.run(read())
+    release.set()
+    assert chunks[-1] == ": keep-alive\n\n"
+    # Other coroutines kept running while the stream waited for events
+    assert ticks >= 5
+
+
+def test_finished_job_keeps_retained_payloads(tmp_path):
+    def target(job):
+        job.emit('partial', {"results": ["big"] * 100}, retained={"record_ids": ["a"]})
+
+    job = run_job(make_manager(tmp_path), target)
+    partial = [data for event, data, _ in job.events if event == 'partial']
+    assert partial == [{"record_ids": ["a"]}]
+    assert job.events[-1][0] == 'done'
+
+
+def test_failed_job_ends_with_error_event(tmp_path):
+    def target(job):
+        raise ValueError("boom")
+
+    job = run_job(make_manager(tmp_path), target)
+    event, data, _ = job.events[-1]
+    assert event == 'error'
+    assert data['status'] == 'failed' and data['error'] == 'boom'
+
+
+def test_job_files_are_on_disk_and_pruned_with_the_job(tmp_path):
+    def target(job):
+        job.save_file(0, b"%PDF-1.4", suffix='.pdf')
+
+    manager = make_manager(tmp_path, retention_seconds=0)
+    job = run_job(manager, target)
+    path = job.files[0]
+    with open(path, 'rb') as f:
+        assert f.read() == b"%PDF-1.4"
+
+    time.sleep(0.01)
+    manager.submit('test', 1, lambda job: None)  # Submitting prunes expired jobs
+    assert manager.get(job.id) is None
+    assert not os.path.exists(path)
+    assert job.files == {}
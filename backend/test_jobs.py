@@ -0,0 +1,25 @@
+import requests
+import json
+
+base_url = "http://localhost:8000"
+items = [
+    {"Soil_N": 45, "Soil_P": 20, "Soil_K": 60, "Soil_pH": ph, "Soil_Moisture": 30, "Crop_Name": "Rice", "Season": "Kharif", "response_mode": "compact"}
+    for ph in [5.5, 6.0, 6.5, 7.0, 7.5]
+]
+
+try:
+    # Streamed chat reply
+    with requests.post(f"{base_url}/chat/stream", json={"query": "How should I irrigate rice?"}, stream=True) as response:
+        print(response.status_code)
+        for line in response.iter_lines(decode_unicode=True):
+            if line: print(line)
+
+    # Background batch prediction
+    job = requests.post(f"{base_url}/jobs/predict", json={"items": items}).json()
+    print(job)
+    with requests.get(f"{base_url}{job['events_url']}", stream=True) as response:
+        for line in response.iter_lines(decode_unicode=True):
+            if line: print(line)
+    print(requests.get(f"{base_url}{job['status_url']}").json())
+except Exception as e:
+    print(f"Error: {e}")
@@ -0,0 +1,59 @@
+import pytest
+
+import session_store
+from session_store import SessionStore, MAX_SESSION_ID_LENGTH
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(session_store.time, 'monotonic', fake)
+    return fake
+
+
+def test_lru_eviction(clock):
+    store = SessionStore(max_sessions=2, ttl_seconds=100)
+    a = store.get('a')
+    store.get('b')
+    assert store.get('a') is a  # 'a' is now the most recently used
+    store.get('c')  # evicts 'b'
+
+    stats = store.stats()
+    assert stats['active_sessions'] == 2
+    assert stats['evicted_lru'] == 1
+    assert stats['hits'] == 1
+    assert stats['misses'] == 3
+    assert store.get('a') is a
+    store.get('b')  # recreated, evicting 'c'
+    assert store.stats()['evicted_lru'] == 2
+
+
+def test_ttl_expiry(clock):
+    store = SessionStore(max_sessions=10, ttl_seconds=100)
+    a = store.get('a')
+    a.crop = 'rice'
+    clock.now += 50
+    store.get('b')
+    clock.now += 60  # 'a' idle for 110s, 'b' for 60s
+
+    stats = store.stats()
+    assert stats['active_sessions'] == 1
+    assert stats['evicted_ttl'] == 1
+    fresh = store.get('a')
+    assert fresh is not a and fresh.crop is None
+    assert store.stats()['evicted_lru'] == 0
+
+
+def test_long_session_id_is_rejected():
+    store = SessionStore()
+    store.get('x' * MAX_SESSION_ID_LENGTH)
+    with pytest.raises(ValueError):
+        store.get('x' * MAX_SESSION_ID_LENGTH + 'y')
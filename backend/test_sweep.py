@@ -0,0 +1,34 @@
+import requests
+import json
+
+url = "http://localhost:8000/predict/sweep"
+payload = {
+    "base": {
+        "Soil_N": 45,
+        "Soil_P": 20,
+        "Soil_K": 60,
+        "Soil_pH": 6.5,
+        "Soil_Moisture": 30,
+        "Crop_Name": "Rice",
+        "Season": "Kharif"
+    },
+    "ranges": {"Soil_pH": {"start": 5.0, "stop": 8.5, "steps": 8}},
+    "values": {"Crop_Name": ["Rice", "Wheat", "Maize"]}
+}
+
+try:
+    response = requests.post(url, json=payload)
+    print(response.status_code)
+    data = response.json()
+    print(f"Points: {data['points']}")
+    for i in range(data['points']):
+        print(data['grid']['Soil_pH'][i], data['grid']['Crop_Name'][i],
+              data['Recommended_Fertilizer_Type'][i],
+              data['Fertilizer_Quantity_kg_per_acre'][i],
+              data['Crop_Success_Probability'][i])
+
+    # Oversized grids are rejected up front (expect 400)
+    huge = {"base": payload["base"], "values": {f: list(range(600)) for f in ["Soil_N", "Soil_P", "Soil_K", "Soil_pH", "Soil_Moisture"]}}
+    print(requests.post(url, json=huge).status_code)
+except Exception as e:
+    print(f"Error: {e}")
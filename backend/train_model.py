@@ -9,8 +9,10 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, LabelEncoder, OneHotEncoder
 from sklearn.compose import ColumnTransformer
 import joblib
+import json
 import os
 import matplotlib.pyplot as plt
+from drift_monitor import build_baseline
 
 # 1. Load Data
 # Assuming dataset is in the parent directory as per user structure
@@ -122,6 +124,18 @@ model.save('fertilizer_model.keras')
 joblib.dump(preprocessor, 'preprocessor.pkl')
 joblib.dump(le_type, 'label_encoder.pkl')
 
+# Reference distributions for the live drift monitor (/monitor/drift)
+print("Saving drift baseline...")
+baseline_pred = model.predict(X_processed, batch_size=1024, verbose=0)
+baseline = build_baseline(
+    X, numeric_features, categorical_features,
+    le_type.inverse_transform(np.argmax(baseline_pred[0], axis=1)),
+    np.maximum(baseline_pred[1][:, 0], 0),
+    np.clip(baseline_pred[2][:, 0], 0, 1),
+)
+with open('drift_baseline.json', 'w', encoding='utf-8') as f:
+    json.dump(baseline, f, indent=2)
+
 
 # Plot Loss
 plt.figure(figsize=(10, 6))
@@ -24,7 +24,12 @@ function AppContent() {
     setResult(null);
     try {
       // Ensure backend is running at localhost:8000
-      const response = await axios.post('http://localhost:8000/predict', formData);
+      const response = await axios.post('http://localhost:8000/predict', {
+        ...formData,
+        // Lets the backend file this prediction under the farmer's history
+        farmer_name: farmerData?.name,
+        location: farmerData?.location
+      });
       setResult({ ...response.data, landArea: formData.landArea });
       navigate('/result');
     } catch (err) {
@@ -144,7 +149,7 @@ function AppContent() {
       <footer style={{ textAlign: 'center', padding: '2rem', color: '#718096', marginTop: '4rem' }}>
         <p>{t.footerText}</p>
       </footer>
-      <Chatbot language={language} />
+      <Chatbot language={language} predictionId={result?.record_id} />
     </div>
   );
 }
@@ -1,11 +1,13 @@
 
 import React, { useState, useRef, useEffect } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
-import axios from 'axios';
 import './Chatbot.css';
 import { translations } from '../i18n';
 
-const Chatbot = ({ language }) => {
+// One chat session per page load so the backend can follow up on earlier questions
+const sessionId = (window.crypto && window.crypto.randomUUID) ? window.crypto.randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+
+const Chatbot = ({ language, predictionId }) => {
     const [isOpen, setIsOpen] = useState(false);
     // REMOVED local chatLanguage state. Strictly use prop 'language'.
     const [messages, setMessages] = useState([]);
@@ -80,11 +82,11 @@ const Chatbot = ({ language }) => {
     };
 
     // Voice Support - Text to Speech
-    const speakResponse = (text, lang) => {
+    const speakResponse = (text, lang, queue = false) => {
         if (!('speechSynthesis' in window)) return;
 
-        // Cancel current speech if any
-        window.speechSynthesis.cancel();
+        // Cancel current speech if any (queued sentences of a streamed reply play in order)
+        if (!queue) window.speechSynthesis.cancel();
 
         const utterance = new SpeechSynthesisUtterance(text);
         // STRICT: Use the passed language for speech synthesis
@@ -110,18 +112,52 @@ const Chatbot = ({ language }) => {
         const requestLanguage = language;
 
         try {
-            const response = await axios.post('http://localhost:8000/chat', {
-                query: textToSend,
-                language: requestLanguage
+            // Stream the reply sentence by sentence (server-sent events) so speech starts immediately
+            const response = await fetch('http://localhost:8000/chat/stream', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({
+                    query: textToSend,
+                    language: requestLanguage,
+                    session_id: sessionId,
+                    prediction_id: predictionId
+                })
             });
-
-            const botReply = response.data.reply;
-            const botMessage = { type: 'bot', text: botReply };
-
-            setMessages(prev => [...prev, botMessage]);
-
-            // Speak the response
-            speakResponse(botReply, requestLanguage);
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let botReply = '';
+            let first = true;
+
+            const handleSentence = (text) => {
+                botReply = botReply ? `${botReply} ${text}` : text;
+                const replySoFar = botReply;
+                if (first) {
+                    setIsTyping(false);
+                    setMessages(prev => [...prev, { type: 'bot', text: replySoFar }]);
+                } else {
+                    setMessages(prev => [...prev.slice(0, -1), { type: 'bot', text: replySoFar }]);
+                }
+                // Speak the response
+                speakResponse(text, requestLanguage, !first);
+                first = false;
+            };
+
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+                for (const event of events) {
+                    const type = event.match(/^event: (.*)$/m)?.[1];
+                    const data = event.match(/^data: (.*)$/m)?.[1];
+                    if (type === 'sentence' && data) handleSentence(JSON.parse(data).text);
+                }
+            }
+            if (first) throw new Error('Empty reply');
 
         } catch (error) {
             console.error(error);